@@ -0,0 +1,28 @@
+# app/api/health.py
+from fastapi import APIRouter, Request, status
+from fastapi.responses import ORJSONResponse
+
+from app.core.health import readiness_check
+
+router = APIRouter(tags=["health"], include_in_schema=False)
+
+
+@router.get("/health", status_code=status.HTTP_200_OK)
+async def health():
+    """Liveness: the process serves requests. No I/O, so a slow DB never gets the worker restarted."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready(request: Request):
+    """Readiness: startup finished, DB reachable with free connections, schema in place (503 otherwise)."""
+    if not getattr(request.app.state, "ready", False):
+        return ORJSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "unavailable", "checks": {"app": "starting or shutting down"}},
+        )
+    ok, checks = await readiness_check.run()
+    return ORJSONResponse(
+        status_code=status.HTTP_200_OK if ok else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "ready" if ok else "unavailable", "checks": {"app": "ok", **checks}},
+    )
@@ -0,0 +1,27 @@
+# app/api/internal.py
+from fastapi import APIRouter, status
+
+from app.core.password_hasher import password_hasher
+from app.core.startup_profile import startup_profile
+from app.db.pool import get_pool_status
+from app.db.session import database
+
+router = APIRouter(prefix="/internal", tags=["internal"], include_in_schema=False)
+
+
+@router.get("/db/pool", status_code=status.HTTP_200_OK)
+async def db_pool_status():
+    """Live connection pool occupancy and checkout wait time histogram."""
+    return {name: get_pool_status(engine.pool) for name, engine in database.engines().items()}
+
+
+@router.get("/password-hasher", status_code=status.HTTP_200_OK)
+async def password_hasher_status():
+    """bcrypt pool size, queue depth and rejected calls."""
+    return password_hasher.stats()
+
+
+@router.get("/startup", status_code=status.HTTP_200_OK)
+async def startup_report():
+    """Import and startup phase timings of this worker."""
+    return startup_profile.report()
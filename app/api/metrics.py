@@ -0,0 +1,62 @@
+# app/api/metrics.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import registry
+from app.core.password_hasher import password_hasher
+from app.db.pool import get_pool_status
+from app.db.session import database
+from app.middlewares.in_flight_middleware import in_flight
+
+router = APIRouter(include_in_schema=False)
+
+# pool status key -> (metric name, type, help)
+POOL_GAUGES = {
+    "size": ("db_pool_size", "gauge", "Configured pool size."),
+    "checked_out": ("db_pool_checked_out", "gauge", "Connections currently in use."),
+    "overflow": ("db_pool_overflow", "gauge", "Connections above pool size (negative = unopened slots)."),
+    "checkouts": ("db_pool_checkouts_total", "counter", "Successful connection checkouts."),
+    "timeouts": ("db_pool_timeouts_total", "counter", "Checkouts that timed out waiting for a connection."),
+    "connects": ("db_pool_connects_total", "counter", "New DB connections opened."),
+    "invalidations": ("db_pool_invalidations_total", "counter", "Connections dropped as stale or broken."),
+}
+
+
+@registry.collector
+def collect_in_flight():
+    yield "http_requests_in_flight", "gauge", "Requests being handled.", [("", {}, in_flight.count)]
+
+
+@registry.collector
+def collect_db_pools():
+    if not database.connected:  # never connect just to be scraped
+        return
+    pools = {name: get_pool_status(engine.pool) for name, engine in database.engines().items()}
+    for key, (name, metric_type, documentation) in POOL_GAUGES.items():
+        samples = [("", {"pool": pool}, status[key]) for pool, status in pools.items() if key in status]
+        yield name, metric_type, documentation, samples
+
+    wait_samples = []
+    for pool, status in pools.items():
+        if "wait_time_histogram" not in status:
+            continue
+        for bound, count in status["wait_time_histogram"].items():
+            wait_samples.append(("_bucket", {"pool": pool, "le": bound}, count))
+        wait_samples.append(("_count", {"pool": pool}, status["checkouts"] + status["timeouts"]))
+        wait_samples.append(("_sum", {"pool": pool}, status["wait_time_sum"]))
+    yield "db_pool_wait_seconds", "histogram", "Time spent waiting for a pooled connection.", wait_samples
+
+
+@registry.collector
+def collect_password_hasher():
+    stats = password_hasher.stats()
+    yield "password_hasher_pending", "gauge", "bcrypt calls queued or running.", [("", {}, stats["pending"])]
+    yield "password_hasher_queue_depth", "gauge", "bcrypt calls waiting for a worker.", [("", {}, stats["queue_depth"])]
+    yield "password_hasher_completed_total", "counter", "bcrypt calls finished.", [("", {}, stats["completed"])]
+    yield "password_hasher_rejected_total", "counter", "bcrypt calls rejected with 503.", [("", {}, stats["rejected"])]
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition of the app metrics of this worker."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
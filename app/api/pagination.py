@@ -0,0 +1,31 @@
+# app/api/pagination.py
+from typing import Optional
+
+from fastapi import Query
+from fastapi.exceptions import RequestValidationError
+
+from app.core.config import get_settings
+
+
+def page_limit(
+        limit: Optional[int] = Query(
+            None, ge=1, description="Page size: PAGINATION_DEFAULT_LIMIT if omitted, at most PAGINATION_MAX_LIMIT"
+        ),
+) -> int:
+    """
+    Dependency: the ``limit`` query parameter. The bounds come from the
+    settings per request rather than at import; past the maximum the 422 is
+    the one a ``le=`` constraint would produce.
+    """
+    settings = get_settings()
+    if limit is None:
+        return settings.PAGINATION_DEFAULT_LIMIT
+    if limit > settings.PAGINATION_MAX_LIMIT:
+        raise RequestValidationError([{
+            "type": "less_than_equal",
+            "loc": ("query", "limit"),
+            "msg": f"Input should be less than or equal to {settings.PAGINATION_MAX_LIMIT}",
+            "input": str(limit),
+            "ctx": {"le": settings.PAGINATION_MAX_LIMIT},
+        }])
+    return limit
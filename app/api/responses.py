@@ -0,0 +1,22 @@
+# app/api/responses.py
+from typing import Any
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+
+class ModelResponse(ORJSONResponse):
+    """
+    JSON response for a pydantic model that is already validated.
+
+    Returning a ``Response`` makes FastAPI skip the ``response_model``
+    round trip (validate again, dump to dicts, ``json.dumps``). The model is
+    serialized straight to bytes by pydantic-core instead. Anything else falls
+    back to orjson. Keep ``response_model`` on the route for the OpenAPI schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return to_json(content)
+        return super().render(content)
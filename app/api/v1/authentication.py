@@ -1,13 +1,16 @@
 # app/api/v1/authentication.py
 import logging
-from typing import Annotated
+from typing import Annotated, Optional
 
-from fastapi import Depends, HTTPException, status, APIRouter
+from fastapi import Body, Depends, HTTPException, status, APIRouter
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi_utils.cbv import cbv
 
+from app.api.responses import ModelResponse
 from app.repositories.user_repository import UserRepository, get_user_repository
-from app.schemas.auth import TokenData, LoginResponse, RegisteredResponse, TokenRead
+from app.schemas.auth import (
+    TokenData, LoginResponse, RegisteredResponse, TokenRead, RefreshRequest, RefreshResponse
+)
 from app.schemas.user import UserCreate, UserRead
 from app.services.auth_service import AuthService, get_auth_service, oauth2_scheme
 from app.services.user_service import get_user_service, UserService
@@ -31,40 +34,41 @@ class Auth:
         self.auth_service = auth_service
 
     @router.post("/register", response_model=RegisteredResponse)
-    def register_user(self, user_in: UserCreate):
+    async def register_user(self, user_in: UserCreate):
         """Register a new user and return access token."""
         try:
             # Check if user already exists
-            existing_user = self.user_service.get_user_by_identifier(user_in.username, 'username')
+            existing_user = await self.user_service.get_user_by_identifier(user_in.username, 'username')
             if existing_user:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Username {user_in.username} already registered"
                 )
 
-            user = self.user_service.create_user(user_in)  # Returns UserRead
+            user = await self.user_service.create_user(user_in)  # Returns UserRead
             # Pass the UserRead object directly, not a dict
             access_token = self.auth_service.create_user_token(user)
 
             # Create TokenRead instance
             token = TokenRead(value=access_token, type="bearer")
+            refresh_token = TokenRead(value=await self.auth_service.issue_refresh_token(user.id), type="refresh")
 
-            # Return RegisteredResponse instance
-            return RegisteredResponse(token=token, user=user)
+            # Both parts are validated already, build the envelope without validating again
+            return ModelResponse(RegisteredResponse.model_construct(token=token, user=user, refresh_token=refresh_token))
 
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Registration error: {e}")
+            logger.error("Registration error: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Registration failed"
             )
 
     @router.post("/login", response_model=LoginResponse)
-    def login(self, form_data: OAuth2PasswordRequestForm = Depends()):
+    async def login(self, form_data: OAuth2PasswordRequestForm = Depends()):
         """Authenticate user and return access token."""
-        db_user = self.auth_service.authenticate_user(form_data.username, form_data.password)
+        db_user = await self.auth_service.authenticate_user(form_data.username, form_data.password)
         access_token = self.auth_service.create_user_token(db_user)
 
         # (db_user) Model → (UserRead) Schema Conversions
@@ -72,23 +76,41 @@ class Auth:
 
         # Create TokenRead instance
         token = TokenRead(value=access_token, type="bearer")
+        refresh_token = TokenRead(value=await self.auth_service.issue_refresh_token(db_user.id), type="refresh")
 
-        # Return LoginResponse instance
-        return LoginResponse(token=token, user=user_read)
+        # Both parts are validated already, build the envelope without validating again
+        return ModelResponse(LoginResponse.model_construct(token=token, user=user_read, refresh_token=refresh_token))
 
     @router.post("/token")
     async def token(self, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
-        user_read = self.auth_service.authenticate_user(form_data.username, form_data.password)
+        user_read = await self.auth_service.authenticate_user(form_data.username, form_data.password)
         access_token = self.auth_service.create_user_token(user_read)
-
-        return {"access_token": access_token, "token_type": "bearer"}
+        refresh_token = await self.auth_service.issue_refresh_token(user_read.id)
+
+        return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+    @router.post("/refresh", response_model=RefreshResponse)
+    async def refresh(self, body: RefreshRequest):
+        """Trade a refresh token for a new access token and a new (rotated) refresh token."""
+        access_token, refresh_token = await self.auth_service.refresh(body.refresh_token)
+        return ModelResponse(RefreshResponse.model_construct(
+            token=TokenRead(value=access_token, type="bearer"),
+            refresh_token=TokenRead(value=refresh_token, type="refresh"),
+        ))
+
+    @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+    async def logout(self, token: str = Depends(oauth2_scheme), body: Optional[RefreshRequest] = Body(None)):
+        """Revoke the current access token and, if given, the refresh token's session."""
+        await self.auth_service.revoke_token(token)
+        if body is not None:
+            await self.auth_service.revoke_refresh_token(body.refresh_token)
 
     @router.get("/verify-token", response_model=TokenData)
-    def verify_token(self, token: str = Depends(oauth2_scheme)):
+    async def verify_token(self, token: str = Depends(oauth2_scheme)):
         """Verify token and return user data."""
-        return self.auth_service.validate_and_get_token_data(token)
+        return ModelResponse(await self.auth_service.validate_and_get_token_data(token))
 
     @router.get("/current-user", response_model=UserRead)
-    def current_user(self, token: str = Depends(oauth2_scheme)):
+    async def current_user(self, token: str = Depends(oauth2_scheme)):
         """Get current authenticated user."""
-        return self.auth_service.get_current_user(token)
\ No newline at end of file
+        return ModelResponse(await self.auth_service.get_current_user(token))
\ No newline at end of file
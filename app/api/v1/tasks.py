@@ -1,11 +1,21 @@
 # app/api/v1/tasks.py
-from fastapi import APIRouter
+from datetime import datetime
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Body, Query, Request
 from fastapi import HTTPException, status, Depends
+from fastapi.responses import StreamingResponse
 from fastapi_utils.cbv import cbv
 
-from app.schemas.task import TaskCreate, TaskRead
+from app.api.pagination import page_limit
+from app.api.responses import ModelResponse
+from app.core.cache import response_cache
+from app.repositories.task_repository import TaskRepository
+from app.schemas.pagination import Page, SortOrder
+from app.schemas.task import TaskCreate, TaskRead, TaskBulkResult
 from app.schemas.user import UserRead
 from app.services.auth_service import get_auth_service
+from app.services.export_service import EXPORT_MEDIA_TYPES, ExportFormat, export_rows
 from app.services.task_service import TaskService, get_task_service
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
@@ -15,20 +25,74 @@ router = APIRouter(prefix="/tasks", tags=["tasks"])
 class Tasks:
     service: TaskService = Depends(get_task_service)
 
-    @router.get("/", response_model=list[TaskRead])
-    def list(self):
-        return self.service.list_tasks()
+    @router.get("/", response_model=Page[TaskRead])
+    async def list(
+            self,
+            request: Request,
+            limit: int = Depends(page_limit),
+            cursor: Optional[str] = None,
+            order: SortOrder = "asc",
+            updated_since: Optional[datetime] = Query(None, description="Only tasks changed at or after this time"),
+    ):
+        """
+        Page through tasks by id. With ``updated_since`` only changed tasks are
+        returned, ordered by ``updated_at``; keep the last ``updated_at`` seen
+        as the next sync's ``updated_since`` (inclusive, so re-sent rows are possible).
+        """
+        since = updated_since.isoformat() if updated_since else None
+        key = await response_cache.namespaced_key(
+            f"tasks:{self.service.owner_id}", f"list:{limit}:{order}:{since}:{cursor}"
+        )
+        return await response_cache.respond(
+            request,
+            key,
+            lambda: self.service.list_tasks(limit=limit, cursor=cursor, order=order, updated_since=updated_since),
+        )
+
+    @router.get("/export", response_class=StreamingResponse)
+    async def export(self, format: ExportFormat = "ndjson"):
+        """Stream all tasks of the current user as NDJSON (default) or a JSON array."""
+        owner_id = self.service.owner_id
+        return StreamingResponse(
+            export_rows(lambda db: TaskRepository(db, owner_id), TaskRead, format),
+            media_type=EXPORT_MEDIA_TYPES[format],
+            headers={"Content-Disposition": f"attachment; filename=tasks.{format}"},
+        )
+
+    # declared before "/{task_id}", which would otherwise capture "search"
+    @router.get("/search", response_model=Page[TaskRead])
+    async def search(
+            self,
+            q: str = Query(..., min_length=1, max_length=200, description="Words to look for in task titles"),
+            limit: int = Depends(page_limit),
+            cursor: Optional[str] = None,
+    ):
+        """Tasks whose title matches ``q``, best match first; pass ``next_cursor`` back for the next page."""
+        return ModelResponse(await self.service.search_tasks(q, limit=limit, cursor=cursor))
 
     @router.get("/{task_id}", response_model=TaskRead)
-    def read(self, task_id: int):
-        task = self.service.get_task(task_id)
-        if not task:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Task with id {task_id} not found",
-            )
-        return task
+    async def read(self, request: Request, task_id: int):
+        async def build():
+            task = await self.service.get_task(task_id)
+            if not task:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Task with id {task_id} not found",
+                )
+            return task
+
+        return await response_cache.respond(request, f"task:{self.service.owner_id}:{task_id}", build)
 
     @router.post("/", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
-    def create(self, task_in: TaskCreate):
-        return self.service.create_task(task_in)
+    async def create(self, task_in: TaskCreate):
+        return ModelResponse(await self.service.create_task(task_in), status_code=status.HTTP_201_CREATED)
+
+    @router.post("/bulk", response_model=TaskBulkResult, status_code=status.HTTP_201_CREATED)
+    async def create_bulk(self, items: List[Any] = Body(..., description="TaskCreate objects")):
+        """Create many tasks at once; invalid items are reported by index, the rest are created."""
+        return ModelResponse(await self.service.create_tasks(items), status_code=status.HTTP_201_CREATED)
+
+    @router.patch("/bulk", response_model=TaskBulkResult)
+    async def update_bulk(self, items: List[Any] = Body(..., description="TaskBulkUpdate objects")):
+        """Update many tasks at once; invalid items and unknown ids are reported by index."""
+        return ModelResponse(await self.service.update_tasks(items))
@@ -1,7 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from fastapi_utils.cbv import cbv
 
-from app.schemas.user import UserRead
+from app.api.pagination import page_limit
+from app.api.responses import ModelResponse
+from app.core.cache import response_cache
+from app.repositories.user_repository import UserRepository
+from app.schemas.pagination import Page, SortOrder
+from app.schemas.user import UserRead, UserSortField
+from app.services.export_service import EXPORT_MEDIA_TYPES, ExportFormat, export_rows
 from app.services.user_service import UserService, get_user_service
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -11,13 +20,34 @@ router = APIRouter(prefix="/users", tags=["users"])
 class Users:
     user_service: UserService = Depends(get_user_service)
 
-    @router.get("/", response_model=list[UserRead], status_code=status.HTTP_200_OK)
-    def list(self):
-        return self.user_service.list_users()
+    @router.get("/", response_model=Page[UserRead], status_code=status.HTTP_200_OK)
+    async def list(
+            self,
+            limit: int = Depends(page_limit),
+            cursor: Optional[str] = None,
+            sort: UserSortField = "id",
+            order: SortOrder = "asc",
+            is_active: Optional[bool] = None,
+    ):
+        return ModelResponse(await self.user_service.list_users(
+            limit=limit, cursor=cursor, sort=sort, order=order, is_active=is_active
+        ))
+
+    @router.get("/export", response_class=StreamingResponse, status_code=status.HTTP_200_OK)
+    async def export(self, format: ExportFormat = "ndjson"):
+        """Stream all users as NDJSON (default) or a JSON array."""
+        return StreamingResponse(
+            export_rows(UserRepository, UserRead, format),
+            media_type=EXPORT_MEDIA_TYPES[format],
+            headers={"Content-Disposition": f"attachment; filename=users.{format}"},
+        )
 
     @router.get("/{user_id}", response_model=UserRead, status_code=status.HTTP_200_OK)
-    def read(self, user_id: int):
-        db_user = self.user_service.get_user_by_identifier(user_id)
-        if not db_user:
-            raise HTTPException(status.HTTP_404_NOT_FOUND, f"User with id {user_id} not found")
-        return db_user
+    async def read(self, request: Request, user_id: int):
+        async def build():
+            db_user = await self.user_service.get_user_by_identifier(user_id)
+            if not db_user:
+                raise HTTPException(status.HTTP_404_NOT_FOUND, f"User with id {user_id} not found")
+            return db_user
+
+        return await response_cache.respond(request, f"user:{user_id}", build)
@@ -0,0 +1,203 @@
+# app/core/cache.py
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from functools import cached_property
+from typing import Awaitable, Callable, Optional, Protocol, Tuple
+
+from fastapi import Request, status
+from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.responses import Response
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+    async def incr(self, key: str) -> int: ...
+
+    async def counter(self, key: str) -> int: ...
+
+
+class MemoryCacheBackend:
+    """In-process LRU with per-entry TTL. Each worker process has its own copy."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._counters: dict = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        # counters live outside the LRU: an evicted generation would revive stale pages
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+
+class RedisCacheBackend:
+    """
+    Backend for any client speaking the ``redis.asyncio`` API (redis, valkey,
+    or fakeredis in tests). Shared by all workers, so invalidation is global.
+    """
+
+    def __init__(self, client, prefix: str = "planner:cache:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.client.set(self.prefix + key, value, px=int(ttl * 1000))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*(self.prefix + key for key in keys))
+
+    async def incr(self, key: str) -> int:
+        return await self.client.incr(self.prefix + key)
+
+    async def counter(self, key: str) -> int:
+        return int(await self.client.get(self.prefix + key) or 0)
+
+
+class ResponseCache:
+    """
+    Cache of serialized GET responses with strong ETags.
+
+    Item responses live under fixed keys (``task:1``) and are deleted on write.
+    Collection responses are stored under a namespace generation
+    (``tasks:3:...``); bumping the generation orphans every cached page at once,
+    the stale ones simply expire. The backend is built, and ``ttl`` read,
+    from the settings on first use.
+    """
+
+    @cached_property
+    def backend(self) -> Optional[CacheBackend]:
+        return build_cache_backend()
+
+    @cached_property
+    def ttl(self) -> float:
+        return get_settings().CACHE_TTL_SECONDS
+
+    async def namespaced_key(self, namespace: str, key: str) -> str:
+        generation = 0
+        if self.backend is not None:
+            try:
+                generation = await self.backend.counter(f"gen:{namespace}")
+            except Exception as e:
+                logger.warning("Response cache read failed: %s", e)
+        return f"{namespace}:{generation}:{key}"
+
+    async def respond(self, request: Request, key: str, build: Callable[[], Awaitable[BaseModel]]) -> Response:
+        """Serve ``key`` from the cache, or build, serialize and store it; handles If-None-Match."""
+        cached = await self._get(key)
+        if cached is None:
+            body = to_json(await build())
+            etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+            await self._set(key, etag, body)
+        else:
+            etag, body = cached
+
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if _matches_if_none_match(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    async def delete(self, *keys: str) -> None:
+        """
+        Drop item responses. Called after a commit, so a backend error is only
+        logged: the write succeeded, and the stale entry expires after ``ttl``.
+        """
+        if self.backend is None:
+            return
+        try:
+            await self.backend.delete(*keys)
+        except Exception as e:
+            logger.warning("Response cache invalidation failed: %s", e)
+
+    async def bump(self, namespace: str) -> None:
+        """Invalidate every collection response cached under ``namespace`` (errors logged, as in ``delete``)."""
+        if self.backend is None:
+            return
+        try:
+            await self.backend.incr(f"gen:{namespace}")
+        except Exception as e:
+            logger.warning("Response cache invalidation failed: %s", e)
+
+    async def _get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        if self.backend is None:
+            return None
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            logger.warning("Response cache read failed: %s", e)
+            return None
+        if value is None:
+            return None
+        etag, _, body = value.partition(b" ")
+        return etag.decode(), body
+
+    async def _set(self, key: str, etag: str, body: bytes) -> None:
+        if self.backend is None:
+            return
+        try:
+            await self.backend.set(key, etag.encode() + b" " + body, self.ttl)
+        except Exception as e:
+            logger.warning("Response cache write failed: %s", e)
+
+
+def _matches_if_none_match(value: Optional[str], etag: str) -> bool:
+    """If-None-Match uses the weak comparison, so a ``W/`` prefix is ignored."""
+    if not value:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in value.split(",")}
+    return etag in tags or "*" in tags
+
+
+def build_cache_backend() -> Optional[CacheBackend]:
+    settings = get_settings()
+    if settings.cache_backend == "none":
+        return None
+    if settings.cache_backend == "redis":
+        try:
+            from redis.asyncio import Redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        return RedisCacheBackend(Redis.from_url(settings.CACHE_REDIS_URL))
+    return MemoryCacheBackend(maxsize=settings.CACHE_MAX_ENTRIES)
+
+
+response_cache = ResponseCache()
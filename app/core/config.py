@@ -1,5 +1,5 @@
 # app/core/config.py
-from typing import Optional, List
+from typing import Literal, Optional, List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, PostgresDsn, validator
 from functools import lru_cache
@@ -8,13 +8,62 @@ from functools import lru_cache
 class Settings(BaseSettings):
     # app
     APP_ENV: str = Field(default="production")
+    APP_WARMUP: bool = Field(default=True, description="Warm pools, statements, bcrypt and OpenAPI before reporting ready")
+    SHUTDOWN_DRAIN_TIMEOUT_SECONDS: float = Field(default=10, ge=0, description="Max wait for in-flight requests on shutdown (uvicorn timeout_graceful_shutdown)")
+    LOG_LEVEL: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = Field(default="INFO")
+    LOG_FORMAT: Literal["text", "json"] = Field(default="text")
+    LOG_REQUEST_SAMPLE_RATE: float = Field(default=1.0, ge=0, le=1, description="Share of per-request debug records kept (warnings are always kept)")
+    APP_STARTUP_PROFILE: bool = Field(default=False, description="Log a timing report of import and startup phases")
+    READINESS_CACHE_SECONDS: float = Field(default=2, ge=0, description="How long a /ready result is reused before the DB is probed again")
+    READINESS_DB_TIMEOUT_SECONDS: float = Field(default=2, gt=0, description="Max wait for the /ready DB probe")
+
+    # Production server (gunicorn + uvicorn workers, see app/gunicorn_conf.py)
+    SERVER_BIND: str = Field(default="0.0.0.0:8000")
+    WEB_CONCURRENCY: int = Field(default=0, ge=0, description="Worker processes (0 = one per CPU under gunicorn, 1 otherwise)")
+    SERVER_PRELOAD_APP: bool = Field(default=True, description="Import the app once in the master; workers share it copy-on-write")
+    SERVER_LOOP: Literal["auto", "asyncio", "uvloop"] = Field(default="auto", description="'auto' uses uvloop when installed")
+    SERVER_HTTP: Literal["auto", "h11", "httptools"] = Field(default="auto", description="'auto' uses httptools when installed")
+    SERVER_ACCESS_LOG: bool = Field(default=False, description="Per-request access log lines (costly under load)")
+    SERVER_KEEPALIVE_SECONDS: int = Field(default=5, ge=0)
+    SERVER_WORKER_TIMEOUT_SECONDS: int = Field(default=60, ge=0, description="Restart a worker blocked this long (0 = never)")
+    SERVER_MAX_REQUESTS: int = Field(default=10000, ge=0, description="Recycle a worker after N requests to cap memory growth (0 = never)")
+    SERVER_MAX_REQUESTS_JITTER: int = Field(default=1000, ge=0, description="Random extra requests so workers do not recycle together")
 
     # Security
     ACCESS_TOKEN_SECRET_KEY: str = Field(default="", min_length=32)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30)
     ACCESS_TOKEN_ALGORITHM: str = Field(default="HS256")
+    REFRESH_TOKEN_EXPIRE_DAYS: int = Field(default=30, ge=1, description="Lifetime of a login session's refresh tokens")
+    TOKEN_CACHE_SIZE: int = Field(default=10000, ge=0, description="Validated tokens kept in memory (0 = disabled)")
+    TOKEN_CACHE_TTL_SECONDS: Optional[float] = Field(default=None, ge=0, description="Max age of a cached token/user snapshot (unset = 60, or TOKEN_REVOCATION_SYNC_SECONDS with several workers)")
+    TOKEN_REVOCATION_SYNC_SECONDS: float = Field(default=5, gt=0, description="How often revocations by other workers are picked up")
+    TOKEN_REVOCATION_SWEEP_SECONDS: float = Field(default=300, gt=0, description="How often expired revocations are purged")
     API_SECRET_KEY: str = Field(description="API secret key value", default="")
+    API_SECRET_ROTATING_KEYS: List[str] = Field(default=[], description="Extra API keys still accepted during rotation (JSON list)")
     API_SECRET_HEADER_NAME: str = Field(default="X-API-Secret", description="Header name for API secret")
+    PASSWORD_HASH_WORKERS: int = Field(default=2, ge=0, description="bcrypt worker processes (0 = threads, one per CPU)")
+    PASSWORD_HASH_MAX_PENDING: int = Field(default=64, ge=1, description="bcrypt calls queued or running before 503")
+
+    # Rate limiting ("<count>/<second|minute|hour|day>", empty = off)
+    RATE_LIMIT_ENABLED: bool = Field(default=True)
+    RATE_LIMIT_BACKEND: Literal["memory", "redis"] = Field(default="memory", description="'memory' counts per worker process")
+    RATE_LIMIT_REDIS_URL: str = Field(default="redis://localhost:6379/0", description="Used when RATE_LIMIT_BACKEND=redis")
+    RATE_LIMIT_AUTH_PER_IP: str = Field(default="20/minute", description="login/token/register calls per client IP")
+    RATE_LIMIT_AUTH_PER_USERNAME: str = Field(default="10/minute", description="login/token/register calls per username")
+    RATE_LIMIT_PER_API_KEY: str = Field(default="", description="All requests per API key")
+
+    # Pagination
+    PAGINATION_DEFAULT_LIMIT: int = Field(default=50, ge=1)
+    PAGINATION_MAX_LIMIT: int = Field(default=500, ge=1)
+    TASK_BULK_MAX_ITEMS: int = Field(default=1000, ge=1, description="Max tasks per bulk create/update request")
+    SEARCH_MAX_RESULTS: int = Field(default=1000, ge=1, description="Deepest task search result reachable by paging (bounds the OFFSET rescan)")
+    EXPORT_BATCH_SIZE: int = Field(default=1000, ge=1, description="Rows fetched per round trip by export endpoints")
+
+    # Response cache
+    CACHE_BACKEND: Optional[Literal["memory", "redis", "none"]] = Field(default=None, description="Where cached GET responses are kept (unset = memory with one worker, none with several)")
+    CACHE_TTL_SECONDS: float = Field(default=30, gt=0, description="Max age of a cached response")
+    CACHE_MAX_ENTRIES: int = Field(default=10000, ge=1, description="Entries kept by the memory backend")
+    CACHE_REDIS_URL: str = Field(default="redis://localhost:6379/0", description="Used when CACHE_BACKEND=redis")
 
     # Database
     DB_HOST: str = Field(default="localhost")
@@ -23,6 +72,47 @@ class Settings(BaseSettings):
     DB_PASSWORD: str = Field(default="")
     DB_NAME: str = Field(default="")
     DB_URL: str = Field(default="")
+    DB_ASYNC: bool = Field(default=False, description="Serve requests through the async engine (asyncpg/aiosqlite)")
+    DB_ASYNC_URL: str = Field(default="", description="Async driver URL; derived from DB_URL when empty")
+    DB_REPLICA_URLS: List[str] = Field(default=[], description="Read replica URLs (JSON list); GET-style reads are spread over them")
+    DB_POOL_SIZE: int = Field(default=5, ge=1, description="Connections kept open per engine")
+    DB_MAX_OVERFLOW: int = Field(default=10, ge=-1, description="Extra connections allowed above pool size (-1 = unlimited)")
+    DB_POOL_TIMEOUT: float = Field(default=30, gt=0, description="Seconds to wait for a free connection")
+    DB_POOL_RECYCLE: int = Field(default=1800, ge=-1, description="Reconnect connections older than N seconds (-1 = never)")
+    DB_POOL_PRE_PING: bool = Field(default=True, description="Test connections on checkout to drop stale ones")
+    DB_MAX_CONNECTIONS: int = Field(default=0, ge=0, description="Connections per DB server for all workers together; caps each worker's pool (0 = no budget)")
+    DB_POOL_WARM_CONNECTIONS: int = Field(default=2, ge=0, description="Connections opened per engine at startup (capped at DB_POOL_SIZE)")
+    DB_CREATE_SCHEMA: Optional[bool] = Field(default=None, description="Run create_all on startup (unset = everywhere but production)")
+
+    # Query instrumentation
+    DB_QUERY_BUDGET: int = Field(default=0, ge=0, description="Max statements per request (0 = no budget)")
+    DB_QUERY_REPEAT_THRESHOLD: int = Field(default=0, ge=0, description="Flag a statement run N times in one request (0 = off)")
+    DB_QUERY_BUDGET_ACTION: Literal["warn", "raise"] = Field(default="warn", description="'raise' is meant for dev/test")
+
+    @property
+    def worker_count(self) -> int:
+        """Processes serving the app; app/gunicorn_conf.py exports its resolved worker count."""
+        return self.WEB_CONCURRENCY or 1
+
+    @property
+    def cache_backend(self) -> str:
+        # a memory cache is only invalidated in the worker that handled the write
+        if self.CACHE_BACKEND is not None:
+            return self.CACHE_BACKEND
+        return "memory" if self.worker_count == 1 else "none"
+
+    @property
+    def token_cache_ttl(self) -> float:
+        # another worker's cached snapshot of a deactivated user lives this long
+        if self.TOKEN_CACHE_TTL_SECONDS is not None:
+            return self.TOKEN_CACHE_TTL_SECONDS
+        return 60 if self.worker_count == 1 else self.TOKEN_REVOCATION_SYNC_SECONDS
+
+    @property
+    def create_schema(self) -> bool:
+        if self.DB_CREATE_SCHEMA is not None:
+            return self.DB_CREATE_SCHEMA
+        return self.APP_ENV != "production"
 
     model_config = SettingsConfigDict(
         env_file_encoding="utf-8",
@@ -33,9 +123,5 @@ class Settings(BaseSettings):
 
 @lru_cache()
 def get_settings() -> Settings:
-    """Cache settings instance"""
+    """Cache settings instance, built on first call (not at import)"""
     return Settings()
-
-
-# Global instance (optional, but use get_settings() is preferred)
-app_settings = get_settings()
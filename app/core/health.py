@@ -0,0 +1,123 @@
+# app/core/health.py
+import asyncio
+import logging
+import time
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+from app.db.base import Base
+from app.db.pool import get_pool_status
+from app.db.session import database
+
+logger = logging.getLogger(__name__)
+
+Checks = Dict[str, str]  # check name -> "ok" or the reason it failed
+
+
+class ReadinessCheck:
+    """
+    Dependency probes behind ``/ready``, cached for ``ttl`` seconds.
+
+    Probes arriving while a check runs wait for that check instead of
+    starting their own, so every worker sends at most one ``SELECT 1`` plus
+    the table and column reflection (one query each on Postgres) per ``ttl``,
+    however often it is probed. The pool
+    is inspected first: when it is exhausted the DB is not queried at all,
+    since the probe would just queue behind the requests for a connection.
+    ``ttl`` and the DB timeout are read from the settings on first use.
+    """
+
+    def __init__(self):
+        self._result: Optional[Tuple[bool, Checks]] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @cached_property
+    def ttl(self) -> float:
+        return get_settings().READINESS_CACHE_SECONDS
+
+    @cached_property
+    def db_timeout(self) -> float:
+        return get_settings().READINESS_DB_TIMEOUT_SECONDS
+
+    async def run(self) -> Tuple[bool, Checks]:
+        if self._fresh():
+            return self._result
+        async with self._lock:
+            if not self._fresh():  # another probe may have refreshed it while we waited
+                self._result = await self._check()
+                self._checked_at = time.monotonic()
+        return self._result
+
+    def _fresh(self) -> bool:
+        return self._result is not None and time.monotonic() - self._checked_at < self.ttl
+
+    async def _check(self) -> Tuple[bool, Checks]:
+        engines = database.serving_engines()
+        checks: Checks = {"pool": self._check_pools(engines)}
+        if checks["pool"] != "ok":
+            checks["database"] = checks["schema"] = "skipped"
+            return False, checks
+
+        try:
+            missing = await asyncio.wait_for(missing_schema(engines[0]), self.db_timeout)
+        except asyncio.TimeoutError:
+            checks["database"] = f"no response within {self.db_timeout:g}s"
+        except Exception as e:
+            logger.warning("Readiness check: database unreachable: %s", e)
+            checks["database"] = f"unreachable: {type(e).__name__}"
+        else:
+            checks["database"] = "ok"
+            checks["schema"] = f"missing: {', '.join(missing)}" if missing else "ok"
+        checks.setdefault("schema", "skipped")
+        return all(value == "ok" for value in checks.values()), checks
+
+    @staticmethod
+    def _check_pools(engines: List) -> str:
+        for engine in engines:
+            status = get_pool_status(engine.pool)
+            if "size" not in status or status["max_overflow"] < 0:
+                continue  # non-queue pool or unlimited overflow: cannot run out
+            if status["checked_out"] >= status["size"] + status["max_overflow"]:
+                return f"exhausted: {status['checked_out']} connections checked out"
+        return "ok"
+
+
+async def missing_schema(engine: Union[Engine, AsyncEngine]) -> List[str]:
+    """
+    Ping the database and list what the models map but it lacks (schema not
+    migrated): whole tables by name, columns of existing tables as ``table.column``.
+    """
+
+    def find_missing(connection: Connection) -> List[str]:
+        connection.execute(text("SELECT 1"))
+        inspector = inspect(connection)
+        existing = set(inspector.get_table_names())
+        missing = [name for name in Base.metadata.tables if name not in existing]
+        present = [name for name in Base.metadata.tables if name in existing]
+        if present:
+            # one reflection query for all tables where the dialect supports it
+            for (_, table), columns in inspector.get_multi_columns(filter_names=present).items():
+                names = {column["name"] for column in columns}
+                mapped = Base.metadata.tables[table].columns
+                missing += [f"{table}.{column.name}" for column in mapped if column.name not in names]
+        return sorted(missing)
+
+    if isinstance(engine, AsyncEngine):
+        async with engine.connect() as connection:
+            return await connection.run_sync(find_missing)
+
+    def run_sync() -> List[str]:
+        with engine.connect() as connection:
+            return find_missing(connection)
+
+    return await run_in_threadpool(run_sync)
+
+
+readiness_check = ReadinessCheck()
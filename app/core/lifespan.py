@@ -0,0 +1,182 @@
+# app/core/lifespan.py
+import asyncio
+import logging
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
+from typing import AsyncIterator, Dict, List, Union
+
+from fastapi import FastAPI
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import Settings, get_settings
+from app.core.health import missing_schema
+from app.core.log_config import configure_logging
+from app.core.password_hasher import password_hasher
+from app.core.revocation import revocation_list
+from app.core.security import load_hash_backend
+from app.core.startup_profile import startup_profile
+from app.db.base import init_db
+from app.db.session import database, session_scope
+from app.repositories.task_repository import TaskRepository
+from app.repositories.user_repository import UserRepository
+
+logger = logging.getLogger(__name__)
+
+# tables (and columns, as table.column) added after the first release -> the script in migrations/ adding them
+MIGRATIONS: Dict[str, str] = {
+    "tasks.owner_id": "001_tasks_owner_id.sql",
+    "tasks.created_at": "001_tasks_owner_id.sql",
+    "tasks.updated_at": "001_tasks_owner_id.sql",
+    "revoked_tokens": "003_token_tables.sql",
+    "refresh_tokens": "003_token_tables.sql",
+}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Startup: build the engines, create the schema outside production, load
+    the token revocation list (then keep it synced in the background) and
+    warm everything the first requests would otherwise pay for. Only then is
+    ``app.state.ready`` set. Shutdown: release the bcrypt workers and the
+    engines.
+
+    Draining is uvicorn's job, not ours: on SIGTERM it closes the listening
+    socket and idle connections, then waits up to ``timeout_graceful_shutdown``
+    (SHUTDOWN_DRAIN_TIMEOUT_SECONDS, see gunicorn_conf) for running requests.
+    Lifespan shutdown only starts after that, with nothing left in flight.
+    While a worker drains, a probe cannot reach it, which already reads as not ready.
+    """
+    settings = get_settings()
+    # level, text/JSON, sampling; per worker process, since the handler thread would not survive a fork
+    configure_logging(settings)
+    app.state.ready = False
+    warn_per_process_state(settings)
+
+    # engines are built here rather than at import, so importing the app stays cheap
+    with startup_profile.phase("db_connect"):
+        database.connect()
+    # in production the schema is managed separately; create_all costs catalog queries per table
+    if settings.create_schema:
+        with startup_profile.phase("create_schema"):
+            await run_in_threadpool(init_db)
+    try:
+        with startup_profile.phase("load_revocations"):
+            async with migrated_schema():
+                await revocation_list.sync()
+        if settings.APP_WARMUP:
+            async with migrated_schema():
+                await warm_up(app, settings)
+    except BaseException:
+        # the worker exits on a failed startup; pooled connections (aiosqlite threads) must not keep it alive
+        await database.dispose()
+        raise
+    revocation_task = asyncio.create_task(revocation_list.run(), name="token-revocation-sync")
+
+    app.state.ready = True
+    startup_profile.mark_ready()
+    if settings.APP_STARTUP_PROFILE:
+        logger.info("Startup profile: %s", startup_profile.report())
+
+    yield
+
+    app.state.ready = False
+    # wait for the cancellation to land: a sync still running must not outlive the engines
+    revocation_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await revocation_task
+    await run_in_threadpool(password_hasher.shutdown)  # waits for running bcrypt calls
+    await database.dispose()
+
+
+@asynccontextmanager
+async def migrated_schema() -> AsyncIterator[None]:
+    """
+    Startup queries against a database that was not migrated fail with a
+    plain driver error (``no such table``); re-raise those as an error that
+    names what is missing and the migration that adds it.
+    """
+    try:
+        yield
+    except DBAPIError:
+        missing = await missing_schema(database.serving_engines()[0])
+        if not missing:
+            raise
+        scripts = sorted({f"migrations/{MIGRATIONS[name]}" for name in missing if name in MIGRATIONS})
+        if any(name not in MIGRATIONS for name in missing):  # e.g. a base table: an empty database
+            scripts.append("DB_CREATE_SCHEMA=true once for a new database")
+        raise RuntimeError(
+            f"Database schema is not migrated, missing: {', '.join(missing)}; run {' and '.join(scripts)}"
+        ) from None
+
+
+def warn_per_process_state(settings: Settings) -> None:
+    """State that stays consistent in one process only, explicitly configured for several workers."""
+    if settings.worker_count == 1:
+        return
+    if settings.cache_backend == "memory":
+        logger.warning(
+            "CACHE_BACKEND=memory with %d workers: a write invalidates only its own worker's cache, "
+            "others serve stale responses for up to %ss; use redis or none",
+            settings.worker_count, settings.CACHE_TTL_SECONDS,
+        )
+    if settings.token_cache_ttl > settings.TOKEN_REVOCATION_SYNC_SECONDS:
+        logger.warning(
+            "TOKEN_CACHE_TTL_SECONDS=%s with %d workers: deactivated users keep access on other workers that long",
+            settings.token_cache_ttl, settings.worker_count,
+        )
+    if settings.RATE_LIMIT_ENABLED and settings.RATE_LIMIT_BACKEND == "memory":
+        logger.warning("RATE_LIMIT_BACKEND=memory with %d workers: limits apply per worker", settings.worker_count)
+
+
+async def warm_up(app: FastAPI, settings: Settings) -> None:
+    with startup_profile.phase("warm_pools"):
+        for engine in database.serving_engines():
+            await warm_pool(engine, settings.DB_POOL_WARM_CONNECTIONS)
+    with startup_profile.phase("warm_statements"):
+        await warm_statements()
+    with startup_profile.phase("warm_password_hasher"):
+        await password_hasher.warmup(load_hash_backend)
+    with startup_profile.phase("warm_openapi"):
+        if app.openapi_url:
+            app.openapi()
+
+
+async def warm_pool(engine: Union[Engine, AsyncEngine], connections: int) -> None:
+    """Open up to ``connections`` pooled connections at once and hand them back to the pool."""
+    pool_size = getattr(engine.pool, "size", None)
+    if pool_size is None:  # NullPool / StaticPool keep nothing around
+        return
+    connections = min(connections, pool_size())
+    if isinstance(engine, AsyncEngine):
+        async with AsyncExitStack() as stack:
+            for _ in range(connections):
+                await stack.enter_async_context(engine.connect())
+        return
+
+    def open_connections() -> None:
+        opened: List = []
+        try:
+            for _ in range(connections):
+                opened.append(engine.connect())
+        finally:
+            for connection in opened:
+                connection.close()
+
+    await run_in_threadpool(open_connections)
+
+
+async def warm_statements() -> None:
+    """
+    Run the hot repository reads once with keys that match nothing, so their
+    ORM compile state and SQL strings are cached before the first request.
+    """
+    async with session_scope() as db:
+        tasks, users = TaskRepository(db, owner_id=0), UserRepository(db)
+        await tasks.get(0)
+        await tasks.list(limit=1)
+        await users.get_by_id(0)
+        await users.get_by_username("")
+        await users.list(limit=1)
@@ -0,0 +1,93 @@
+# app/core/log_config.py
+import atexit
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+import orjson
+
+from app.core.config import Settings
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# attributes every LogRecord has; anything else came in through ``extra=``
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; ``extra=`` fields are emitted as top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Enqueue the record as is. The stock ``prepare`` formats the message in the
+    calling thread; here ``msg % args`` and the formatter both run on the
+    listener thread, so the request path only pays for a queue put.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class Sampler:
+    """Keeps a ``rate`` fraction of calls; used to thin out per-request logs."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+
+    def sample(self) -> bool:
+        return self.rate >= 1 or random.random() < self.rate
+
+
+request_log_sampler = Sampler(1.0)
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(settings: Settings) -> None:
+    """
+    Route the root logger through an unbounded in-memory queue to a stream
+    handler running on a background thread, so handlers never block a request.
+    """
+    global _listener
+    stop_logging()
+
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT))
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(DeferredQueueHandler(records))
+    root.setLevel(settings.LOG_LEVEL)
+
+    request_log_sampler.rate = settings.LOG_REQUEST_SAMPLE_RATE
+    _listener = QueueListener(records, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
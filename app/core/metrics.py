@@ -0,0 +1,135 @@
+# app/core/metrics.py
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]  # (name suffix, labels, value)
+
+# request latency histogram bucket upper bounds, seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric:
+    """
+    Base of the in-process metrics.
+
+    Samples are plain dict/list updates without locks: requests, auth and
+    rate limiting are all recorded on the event loop thread, so there is no
+    concurrent writer. Values that live elsewhere (DB pools, bcrypt queue)
+    are read at scrape time through ``Registry.collector`` instead.
+    """
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+
+    def samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+    def _labels(self, values: LabelValues) -> Dict[str, str]:
+        return dict(zip(self.labels, values))
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self) -> Iterable[Sample]:
+        for values, value in self._values.items():
+            yield "", self._labels(values), value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+        # per label set: [count per bucket..., +Inf count, sum]
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self) -> Iterable[Sample]:
+        for values, series in self._series.items():
+            labels = self._labels(values)
+            total = 0
+            for bound, count in zip([*map(str, self.buckets), "+Inf"], series):
+                total += count
+                yield "_bucket", {**labels, "le": bound}, total
+            yield "_count", labels, total
+            yield "_sum", labels, series[-1]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[Metric] = []
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, Iterable[Sample]]]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, func: Callable[[], Iterable[Tuple[str, str, str, Iterable[Sample]]]]):
+        """Register ``func`` yielding ``(name, type, help, samples)`` families read at scrape time."""
+        self._collectors.append(func)
+        return func
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)."""
+        lines: List[str] = []
+        families = [(metric.name, metric.type, metric.documentation, metric.samples()) for metric in self._metrics]
+        for collect in self._collectors:
+            families.extend(collect())
+        for name, metric_type, documentation, samples in families:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for suffix, labels, value in samples:
+                lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route template, method and status.", ("method", "route", "status")
+))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template and method.", ("method", "route")
+))
+auth_failures = registry.register(Counter(
+    "auth_failures_total", "Rejected logins, tokens and refresh tokens by reason.", ("reason",)
+))
+rate_limited = registry.register(Counter(
+    "rate_limited_requests_total", "Requests answered with 429 by bucket.", ("bucket",)
+))
@@ -0,0 +1,98 @@
+# app/core/password_hasher.py
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cached_property
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException, status
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hash/verify calls on a dedicated, size-limited executor.
+
+    With ``workers > 0`` a process pool is used, so bcrypt never competes with
+    request handling for the GIL. ``workers == 0`` falls back to a thread pool
+    with one thread per CPU (the bcrypt backend releases the GIL while hashing).
+    At most ``max_pending`` calls may be queued or running; beyond that callers
+    get a 503 instead of an ever growing queue. Both limits come from the
+    settings (PASSWORD_HASH_*) on first use.
+    """
+
+    def __init__(self):
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor: Optional[Executor] = None
+
+    @cached_property
+    def workers(self) -> int:
+        return get_settings().PASSWORD_HASH_WORKERS
+
+    @cached_property
+    def size(self) -> int:
+        return self.workers or os.cpu_count() or 1
+
+    @cached_property
+    def max_pending(self) -> int:
+        return get_settings().PASSWORD_HASH_MAX_PENDING
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.workers > 0:
+                self._executor = ProcessPoolExecutor(max_workers=self.size)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="password-hasher")
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            logger.warning("Password hasher saturated (%d pending), rejecting request", self.pending)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+    async def warmup(self, load_backend: Callable[[], Any]) -> None:
+        """
+        Load the hash backend here and start every worker with it loaded, so
+        the first logins don't pay for process spawn and backend import.
+        """
+        load_backend()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, load_backend) for _ in range(self.size)))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": "process" if self.workers > 0 else "thread",
+            "workers": self.size,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "queue_depth": max(0, self.pending - self.size),
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,131 @@
+# app/core/rate_limit.py
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Protocol
+
+from app.core.config import get_settings
+
+RATE_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class Rate:
+    limit: int
+    window: float  # seconds
+
+
+def parse_rate(value: str) -> Optional[Rate]:
+    """``"20/minute"`` -> Rate(20, 60); an empty string or a zero limit disables the bucket."""
+    if not value:
+        return None
+    try:
+        limit, period = value.split("/")
+        rate = Rate(int(limit), RATE_PERIODS[period.strip().lower()])
+    except (ValueError, KeyError):
+        raise ValueError(f"Invalid rate {value!r}, expected '<count>/<second|minute|hour|day>'")
+    return rate if rate.limit > 0 else None
+
+
+def sliding_window(rate: Rate, now: float, previous: int, current: int) -> float:
+    """
+    Sliding window counter: the previous fixed window counts in proportion to
+    how much of it still overlaps the sliding window. Returns 0 if one more
+    hit fits, otherwise the seconds until it will.
+    """
+    elapsed = (now % rate.window) / rate.window
+    if previous * (1 - elapsed) + current + 1 <= rate.limit:
+        return 0.0
+    if current + 1 <= rate.limit:
+        # wait for the previous window to decay far enough
+        needed = 1 - (rate.limit - current - 1) / previous
+        return (needed - elapsed) * rate.window
+    # the current window alone is full: wait into the next one, where it becomes "previous"
+    needed = 1 - (rate.limit - 1) / current if current else 0
+    return (1 - elapsed + needed) * rate.window
+
+
+class RateLimitBackend(Protocol):
+    async def hit(self, key: str, rate: Rate) -> float: ...
+
+
+class MemoryRateLimitBackend:
+    """
+    Per-process counters: three ints per key (window index, previous and
+    current count). Keys idle for more than a window are purged periodically.
+    Each worker counts on its own, so the effective limit is per worker.
+    """
+
+    PURGE_EVERY = 1024
+
+    def __init__(self):
+        self._counters: Dict[str, List[int]] = {}
+        self._windows: Dict[str, float] = {}
+        self._hits = 0
+
+    async def hit(self, key: str, rate: Rate) -> float:
+        now = time.time()
+        index = int(now // rate.window)
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = [index, 0, 0]
+            self._windows[key] = rate.window
+        elif counter[0] != index:
+            counter[1] = counter[2] if counter[0] == index - 1 else 0
+            counter[2] = 0
+            counter[0] = index
+
+        retry_after = sliding_window(rate, now, counter[1], counter[2])
+        if not retry_after:
+            counter[2] += 1
+
+        self._hits += 1
+        if self._hits % self.PURGE_EVERY == 0:
+            self._purge(now)
+        return retry_after
+
+    def _purge(self, now: float) -> None:
+        for key in [
+            key for key, (index, _, _) in self._counters.items()
+            if index < int(now // self._windows[key]) - 1
+        ]:
+            del self._counters[key]
+            del self._windows[key]
+
+
+class RedisRateLimitBackend:
+    """
+    Shared counters in any ``redis.asyncio``-compatible client (fakeredis in
+    tests): one key per fixed window, expiring after two windows.
+    """
+
+    def __init__(self, client, prefix: str = "planner:ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def hit(self, key: str, rate: Rate) -> float:
+        now = time.time()
+        index = int(now // rate.window)
+        current_key = f"{self.prefix}{key}:{index}"
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.get(f"{self.prefix}{key}:{index - 1}")
+            pipe.incr(current_key)
+            pipe.expire(current_key, math.ceil(rate.window * 2))
+            previous, current, _ = await pipe.execute()
+
+        # the INCR above is this hit; undo it if it is rejected
+        retry_after = sliding_window(rate, now, int(previous or 0), current - 1)
+        if retry_after:
+            await self.client.decr(current_key)
+        return retry_after
+
+
+def build_rate_limit_backend() -> RateLimitBackend:
+    settings = get_settings()
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        try:
+            from redis.asyncio import Redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package")
+        return RedisRateLimitBackend(Redis.from_url(settings.RATE_LIMIT_REDIS_URL))
+    return MemoryRateLimitBackend()
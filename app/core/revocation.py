@@ -0,0 +1,94 @@
+# app/core/revocation.py
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from functools import cached_property
+from typing import Dict, Optional
+
+from app.core.config import get_settings
+from app.db.session import session_scope
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.repositories.revoked_token_repository import RevokedTokenRepository
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """
+    In-memory set of revoked token ids (``jti``) backed by the revoked_tokens table.
+
+    Lookups are a dict membership test, so checking a token costs no query.
+    Each worker loads the unexpired revocations at startup and then polls the
+    table every ``sync_interval`` seconds for revocations made by other
+    workers; a token revoked elsewhere is therefore accepted for at most that
+    long. Expired entries are swept from memory and from the table every
+    ``sweep_interval`` seconds, since an expired token is rejected anyway.
+    Both intervals are read from the settings on first use.
+    """
+
+    def __init__(self):
+        self._expires_at: Dict[str, float] = {}  # jti -> exp (epoch seconds)
+        self._synced_at: Optional[datetime] = None
+
+    @cached_property
+    def sync_interval(self) -> float:
+        return get_settings().TOKEN_REVOCATION_SYNC_SECONDS
+
+    @cached_property
+    def sweep_interval(self) -> float:
+        return get_settings().TOKEN_REVOCATION_SWEEP_SECONDS
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        return jti is not None and jti in self._expires_at
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        self._expires_at[jti] = expires_at.timestamp()
+
+    def __len__(self) -> int:
+        return len(self._expires_at)
+
+    async def revoke(self, repository: RevokedTokenRepository, jti: str, user_id: int, expires_at: datetime) -> None:
+        await repository.add(jti, user_id, expires_at)
+        self.add(jti, expires_at)
+
+    async def sync(self) -> int:
+        """Load revocations made since the last sync (all unexpired ones the first time)."""
+        now = datetime.now(timezone.utc)
+        # overlap by one interval: rows committed late or stamped by a worker with a skewed clock
+        since = self._synced_at - timedelta(seconds=self.sync_interval) if self._synced_at else None
+        async with session_scope() as db:
+            rows = await RevokedTokenRepository(db).list_active(now, revoked_since=since)
+        for jti, expires_at in rows:
+            if expires_at.tzinfo is None:  # SQLite drops the offset; stored values are UTC
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            self.add(jti, expires_at)
+        self._synced_at = now
+        return len(rows)
+
+    async def sweep(self) -> int:
+        now = time.time()
+        for jti in [jti for jti, expires_at in self._expires_at.items() if expires_at <= now]:
+            del self._expires_at[jti]
+        now_utc = datetime.now(timezone.utc)
+        async with session_scope() as db:
+            # expired refresh tokens are garbage on the same schedule
+            await RefreshTokenRepository(db).delete_expired(now_utc)
+            return await RevokedTokenRepository(db).delete_expired(now_utc)
+
+    async def run(self) -> None:
+        """Background loop: sync every ``sync_interval``, sweep every ``sweep_interval``."""
+        last_sweep = time.monotonic()
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+                if time.monotonic() - last_sweep >= self.sweep_interval:
+                    removed = await self.sweep()
+                    last_sweep = time.monotonic()
+                    logger.debug("Swept %d expired token revocations", removed)
+            except Exception:
+                logger.exception("Token revocation sync failed")
+
+
+revocation_list = RevocationList()
@@ -1,5 +1,9 @@
 # core/security.py
+import hashlib
+import hmac
 import logging
+import secrets
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -8,12 +12,12 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config import get_settings
+from app.core.password_hasher import password_hasher
 from app.schemas.auth import TokenData
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/token")
-settings = get_settings()
 logger = logging.getLogger(__name__)
 
 
@@ -27,11 +31,27 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def load_hash_backend() -> None:
+    """Load and self-test the bcrypt backend (passlib does this lazily on the first hash)."""
+    pwd_context.handler().get_backend()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password hasher pool without blocking the event loop."""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the password hasher pool without blocking the event loop."""
+    return await password_hasher.run(get_password_hash, password)
+
+
 def create_access_token(
         data: dict,
         expires_delta: Optional[timedelta] = None,
 ) -> str:
     """Create JWT access token with proper timezone handling."""
+    settings = get_settings()
     to_encode = data.copy()
 
     if expires_delta:
@@ -39,16 +59,27 @@ def create_access_token(
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    to_encode.update({"exp": expire})
+    # jti identifies this token for revocation
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.ACCESS_TOKEN_SECRET_KEY, algorithm=settings.ACCESS_TOKEN_ALGORITHM)
     return encoded_jwt
 
 
+def create_refresh_token() -> str:
+    """Opaque random refresh token; only its HMAC is stored."""
+    return secrets.token_urlsafe(32)
+
+
+def hash_refresh_token(token: str) -> str:
+    """Keyed hash of a refresh token: a leaked table alone cannot be replayed, and no bcrypt is needed."""
+    return hmac.new(get_settings().ACCESS_TOKEN_SECRET_KEY.encode(), token.encode(), hashlib.sha256).hexdigest()
+
+
 def decode_token(token: str) -> TokenData:
     """Decode and validate JWT token."""
+    settings = get_settings()
     try:
         payload = jwt.decode(token, settings.ACCESS_TOKEN_SECRET_KEY, algorithms=[settings.ACCESS_TOKEN_ALGORITHM])
-        logger.debug(payload)
 
         username: str = payload.get("username")
         user_id: int = payload.get("user_id")
@@ -57,7 +88,7 @@ def decode_token(token: str) -> TokenData:
         if username is None:
             raise JWTError("Token missing username")
 
-        token_data = TokenData(username=username, user_id=user_id, expires_at=exp)
+        token_data = TokenData(username=username, user_id=user_id, expires_at=exp, jti=payload.get("jti"))
         return token_data
     except JWTError:
         raise JWTError("Invalid token")
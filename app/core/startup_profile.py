@@ -0,0 +1,44 @@
+# app/core/startup_profile.py
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+# Must stay free of app/third-party imports: the clock starts when main.py imports this module.
+_IMPORT_STARTED = time.perf_counter()
+
+
+class StartupProfile:
+    """
+    Wall-clock timings of the cold start: module imports, each startup phase
+    and the time until the app is ready. Times are relative to the first
+    import of ``app.main``; interpreter and server boot are not included
+    (``benchmarks/startup.py`` measures those from the outside).
+    """
+
+    def __init__(self, started_at: float):
+        self.started_at = started_at
+        self.phases: Dict[str, float] = {}
+        self.ready_at: Optional[float] = None
+
+    def mark_imported(self) -> None:
+        self.phases["import"] = time.perf_counter() - self.started_at
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+
+    def mark_ready(self) -> None:
+        self.ready_at = time.perf_counter()
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "phases_ms": {name: round(seconds * 1e3, 2) for name, seconds in self.phases.items()},
+            "ready_ms": round((self.ready_at - self.started_at) * 1e3, 2) if self.ready_at else None,
+        }
+
+
+startup_profile = StartupProfile(_IMPORT_STARTED)
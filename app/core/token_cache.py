@@ -0,0 +1,105 @@
+# app/core/token_cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, Optional, Set
+
+from app.core.config import get_settings
+from app.schemas.auth import TokenData
+from app.schemas.user import UserRead
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    token_data: TokenData
+    user: UserRead
+    expires_at: float  # time.monotonic() deadline
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of validated access tokens.
+
+    Keys are SHA-256 digests of the raw token, so no bearer token is kept in
+    memory. An entry lives for ``ttl`` seconds at most and never past the
+    token ``exp``. Entries are dropped per user when the user row changes;
+    with several workers each process has its own cache, so ``ttl`` bounds
+    how long another worker may serve a stale snapshot.
+
+    Size and ``ttl`` come from the settings on first use, not at import.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[bytes, CachedToken]" = OrderedDict()
+        self._keys_by_user: Dict[int, Set[bytes]] = {}
+        self._lock = threading.Lock()
+
+    @cached_property
+    def maxsize(self) -> int:
+        return get_settings().TOKEN_CACHE_SIZE
+
+    @cached_property
+    def ttl(self) -> float:
+        return get_settings().token_cache_ttl
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[CachedToken]:
+        if self.maxsize <= 0:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, token: str, token_data: TokenData, user: UserRead) -> CachedToken:
+        now = time.monotonic()
+        token_ttl = token_data.expires_at.timestamp() - time.time()
+        entry = CachedToken(token_data=token_data, user=user, expires_at=now + min(self.ttl, token_ttl))
+        if self.maxsize <= 0 or token_ttl <= 0:
+            return entry
+
+        key = self._key(token)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._keys_by_user.setdefault(user.id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+        return entry
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for key in self._keys_by_user.pop(user_id, ()):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: bytes) -> None:
+        entry = self._entries.pop(key)
+        keys = self._keys_by_user.get(entry.user.id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[entry.user.id]
+
+
+token_cache = TokenCache()
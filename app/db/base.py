@@ -1,13 +1,15 @@
 from sqlalchemy.ext.declarative import declarative_base
 
-from app.db.session import engine
+from app.db.session import database
 
 Base = declarative_base()
 
 def init_db():
     # This will look at all subclasses of Base and issue CREATE TABLE for each if not exists
-    Base.metadata.create_all(bind=engine)
+    import app.models  # noqa: F401  registers every model, even if nothing imported it yet
+    Base.metadata.create_all(bind=database.connect().engine)
 
 def drop_db():
     # This will drop all tables in the database
-    Base.metadata.drop_all(bind=engine)
+    import app.models  # noqa: F401
+    Base.metadata.drop_all(bind=database.connect().engine)
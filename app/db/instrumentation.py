@@ -0,0 +1,79 @@
+# app/db/instrumentation.py
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised in ``raise`` mode when a request issues too many or repeated statements."""
+
+
+class QueryStats:
+    """Statements executed while handling one request."""
+
+    def __init__(self, budget: int = 0, repeat_threshold: int = 0, action: str = "warn"):
+        self.budget = budget
+        self.repeat_threshold = repeat_threshold
+        self.action = action
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter = Counter()
+        self.violations: list = []
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+        if self.budget and self.count == self.budget + 1:
+            self._violation(f"query budget of {self.budget} exceeded")
+        if self.repeat_threshold and self.statements[statement] == self.repeat_threshold:
+            self._violation(f"statement repeated {self.repeat_threshold} times (N+1?): {statement[:200]}")
+
+    def _violation(self, message: str) -> None:
+        self.violations.append(message)
+        if self.action == "raise":
+            raise QueryBudgetExceeded(message)
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_query_stats() -> QueryStats:
+    """Begin collecting for the current request (context); returns the collector."""
+    settings = get_settings()
+    stats = QueryStats(
+        budget=settings.DB_QUERY_BUDGET,
+        repeat_threshold=settings.DB_QUERY_REPEAT_THRESHOLD,
+        action=settings.DB_QUERY_BUDGET_ACTION,
+    )
+    _current_stats.set(stats)
+    return stats
+
+
+def get_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def instrument_queries(engine: Engine) -> None:
+    """Time every cursor execution and add it to the current request's stats, if any."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_started"].pop()
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(statement, duration)
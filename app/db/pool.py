@@ -0,0 +1,162 @@
+# app/db/pool.py
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core.config import Settings
+
+# Upper bounds (seconds) of the checkout wait time histogram buckets
+WAIT_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolStats:
+    """Counters collected by a timed pool; shared across ``Pool.recreate()``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.wait_time_sum = 0.0
+        self.wait_time_buckets = [0] * (len(WAIT_TIME_BUCKETS) + 1)
+
+    def observe_wait(self, seconds: float, timed_out: bool = False) -> None:
+        index = bisect_left(WAIT_TIME_BUCKETS, seconds)
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_time_sum += seconds
+            self.wait_time_buckets[index] += 1
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets = list(self.wait_time_buckets)
+            data = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "wait_time_sum": self.wait_time_sum,
+            }
+        # cumulative, Prometheus style ("le" = less than or equal)
+        histogram, total = {}, 0
+        for bound, count in zip([*map(str, WAIT_TIME_BUCKETS), "+Inf"], buckets):
+            total += count
+            histogram[bound] = total
+        data["wait_time_histogram"] = histogram
+        return data
+
+
+class TimedPoolMixin:
+    """Measures how long each checkout waits for a connection."""
+
+    stats: PoolStats
+
+    def __init__(self, *args, stats: PoolStats = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = stats or PoolStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except Exception:
+            self.stats.observe_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.stats.observe_wait(time.perf_counter() - started)
+        return record
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep the counters
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def get_pool_limits(settings: Settings) -> Tuple[int, int]:
+    """
+    ``(pool_size, max_overflow)`` of one engine in one worker.
+
+    With DB_MAX_CONNECTIONS set, the budget is split over the workers and over
+    the engines each worker opens against the same server (sync + async with
+    DB_ASYNC), and DB_POOL_SIZE / DB_MAX_OVERFLOW are capped to that share.
+    Every engine keeps at least one connection.
+    """
+    if not settings.DB_MAX_CONNECTIONS:
+        return settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+    engines_per_server = 2 if settings.DB_ASYNC else 1
+    share = max(1, settings.DB_MAX_CONNECTIONS // (settings.worker_count * engines_per_server))
+    pool_size = min(settings.DB_POOL_SIZE, share)
+    overflow_room = share - pool_size
+    max_overflow = overflow_room if settings.DB_MAX_OVERFLOW < 0 else min(settings.DB_MAX_OVERFLOW, overflow_room)
+    return pool_size, max_overflow
+
+
+def get_pool_options(settings: Settings, url: str, is_async: bool = False) -> Dict[str, Any]:
+    """Engine keyword arguments for the configured connection pool."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # in-memory SQLite lives inside a single connection, keep the dialect default pool
+        return {}
+
+    pool_size, max_overflow = get_pool_limits(settings)
+    return {
+        "poolclass": TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def instrument_pool(engine: Engine) -> None:
+    """Count new and invalidated (stale, failed pre-ping) connections."""
+    pool = engine.pool
+    if not isinstance(pool, TimedPoolMixin):
+        return
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        engine.pool.stats.increment("connects")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        engine.pool.stats.increment("invalidations")
+
+
+def get_pool_status(pool: Pool) -> Dict[str, Any]:
+    """Live occupancy plus the collected counters of a pool."""
+    status: Dict[str, Any] = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, TimedPoolMixin):
+        status.update(pool.stats.snapshot())
+    return status
@@ -0,0 +1,37 @@
+# app/db/routing.py
+import itertools
+from typing import Sequence, Type
+
+from sqlalchemy import Select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+# session.info flag: once set, every statement of the session goes to the primary
+PIN_PRIMARY = "pin_primary"
+
+
+def routing_session_class(primary: Engine, replicas: Sequence[Engine]) -> Type[Session]:
+    """
+    Build a ``Session`` class that sends plain reads to the replicas, round-robin.
+
+    Flushes, DML statements and everything after them in the same session run
+    on the primary, so a request always reads its own writes. Repositories
+    call ``pin_primary`` before read-modify-write sequences.
+    """
+    replica_cycle = itertools.cycle(replicas)
+
+    class RoutingSession(Session):
+        def get_bind(self, mapper=None, clause=None, **kwargs):
+            if not replicas or self.info.get(PIN_PRIMARY):
+                return primary
+            if self._flushing or (clause is not None and not isinstance(clause, Select)):
+                self.info[PIN_PRIMARY] = True
+                return primary
+            return next(replica_cycle)
+
+    return RoutingSession
+
+
+def pin_primary(db) -> None:
+    """Route the rest of this session (sync, async or threaded) to the primary."""
+    db.info[PIN_PRIMARY] = True
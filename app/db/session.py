@@ -1,15 +1,222 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Union
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import Settings, get_settings
+from app.db.instrumentation import instrument_queries
+from app.db.pool import get_pool_options, instrument_pool
+from app.db.routing import routing_session_class
+
+# sync driver -> async driver used when DB_ASYNC_URL is not given explicitly
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(sync_url: str) -> str:
+    """Swap the sync driver of a URL for its async counterpart."""
+    url = make_url(sync_url)
+    drivername = ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def get_async_url(settings: Settings) -> str:
+    """Return the async driver URL, deriving it from DB_URL if not configured."""
+    return settings.DB_ASYNC_URL or to_async_url(settings.DB_URL)
+
+
+def build_engine(url: str, settings: Settings) -> Engine:
+    """Sync engine with the configured pool, pool stats and query instrumentation."""
+    new_engine = create_engine(url, **get_pool_options(settings, url))
+    instrument_pool(new_engine)
+    instrument_queries(new_engine)
+    return new_engine
+
+
+def build_async_engine(url: str, settings: Settings) -> AsyncEngine:
+    """Async counterpart of ``build_engine``."""
+    new_engine = create_async_engine(url, **get_pool_options(settings, url, is_async=True))
+    instrument_pool(new_engine.sync_engine)
+    instrument_queries(new_engine.sync_engine)
+    return new_engine
+
+
+class ThreadedSession:
+    """
+    Awaitable facade over a sync ``Session``.
+
+    Exposes the subset of the ``AsyncSession`` API used by the repositories,
+    so the same ``async def`` code runs whether DB_ASYNC is on or off. Each
+    round trip is handed to the threadpool instead of blocking the event loop.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    @property
+    def info(self) -> dict:
+        return self.sync_session.info
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances) -> None:
+        self.sync_session.add_all(instances)
+
+    async def execute(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.execute, statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, *args, **kwargs)
+
+    async def scalars(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalars, statement, *args, **kwargs)
+
+    async def stream_scalars(self, statement, *args, **kwargs) -> "ThreadedScalarResult":
+        result = await run_in_threadpool(self.sync_session.scalars, statement, *args, **kwargs)
+        return ThreadedScalarResult(result)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def delete(self, instance) -> None:
+        await run_in_threadpool(self.sync_session.delete, instance)
 
-from app.core.config import app_settings
+    async def flush(self, objects=None) -> None:
+        await run_in_threadpool(self.sync_session.flush, objects)
 
-engine = create_engine(app_settings.DB_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async def refresh(self, instance, attribute_names=None) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance, attribute_names)
 
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
 
-def get_db():
-    db = SessionLocal()
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+
+class ThreadedScalarResult:
+    """Counterpart of ``AsyncScalarResult``: fetches partitions in the threadpool."""
+
+    def __init__(self, result):
+        self._result = result
+
+    async def partitions(self, size=None) -> AsyncIterator[Sequence]:
+        partitions = self._result.partitions(size)
+        while True:
+            partition = await run_in_threadpool(next, partitions, None)
+            if partition is None:
+                return
+            yield partition
+
+
+DBSession = Union[AsyncSession, ThreadedSession]
+
+class Database:
+    """
+    Engines and session factories, built on first use.
+
+    Nothing connects (or even imports a DB driver, or reads the settings)
+    when this module is imported; the startup handler calls ``connect()``
+    explicitly so the cost is paid, and profiled, before the first request.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        self.settings = settings
+        self.engine: Optional[Engine] = None
+        self.replica_engines: List[Engine] = []
+        self.session_factory: Optional[sessionmaker] = None
+        self.async_engine: Optional[AsyncEngine] = None
+        self.async_replica_engines: List[AsyncEngine] = []
+        self.async_session_factory: Optional[async_sessionmaker] = None
+
+    @property
+    def connected(self) -> bool:
+        return self.engine is not None
+
+    def connect(self) -> "Database":
+        if self.connected:
+            return self
+        settings = self.settings = self.settings or get_settings()
+        self.engine = build_engine(settings.DB_URL, settings)
+        self.replica_engines = [build_engine(url, settings) for url in settings.DB_REPLICA_URLS]
+        self.session_factory = sessionmaker(
+            class_=routing_session_class(self.engine, self.replica_engines),
+            autocommit=False,
+            autoflush=False,
+            bind=self.engine,
+        )
+        if settings.DB_ASYNC:
+            self.async_engine = build_async_engine(get_async_url(settings), settings)
+            self.async_replica_engines = [build_async_engine(to_async_url(url), settings) for url in settings.DB_REPLICA_URLS]
+            # expire_on_commit=False: an expired attribute would lazy-load outside the greenlet and fail
+            self.async_session_factory = async_sessionmaker(
+                self.async_engine,
+                sync_session_class=routing_session_class(
+                    self.async_engine.sync_engine, [replica.sync_engine for replica in self.async_replica_engines]
+                ),
+                autoflush=False,
+                expire_on_commit=False,
+            )
+        return self
+
+    def engines(self) -> Dict[str, Engine]:
+        """Every sync engine (async ones via ``sync_engine``) by display name."""
+        self.connect()
+        engines = {"sync": self.engine}
+        engines.update({f"sync_replica_{i}": replica for i, replica in enumerate(self.replica_engines)})
+        if self.async_engine is not None:
+            engines["async"] = self.async_engine.sync_engine
+        engines.update({
+            f"async_replica_{i}": replica.sync_engine for i, replica in enumerate(self.async_replica_engines)
+        })
+        return engines
+
+    def serving_engines(self) -> List[Union[Engine, AsyncEngine]]:
+        """The engines requests run on: primary first, then the replicas."""
+        self.connect()
+        if self.async_engine is not None:
+            return [self.async_engine, *self.async_replica_engines]
+        return [self.engine, *self.replica_engines]
+
+    async def dispose(self) -> None:
+        for async_engine in [self.async_engine, *self.async_replica_engines]:
+            if async_engine is not None:
+                await async_engine.dispose()
+        for sync_engine in [self.engine, *self.replica_engines]:
+            if sync_engine is not None:
+                sync_engine.dispose()
+        self.__init__(self.settings)
+
+
+database = Database()
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[DBSession]:
+    """Session for code that outlives the request dependencies (e.g. streaming bodies)."""
+    database.connect()
+    if database.async_session_factory is not None:
+        async with database.async_session_factory() as db:
+            yield db
+        return
+
+    db = ThreadedSession(database.session_factory())
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
+
+
+async def get_db() -> AsyncIterator[DBSession]:
+    async with session_scope() as db:
+        yield db
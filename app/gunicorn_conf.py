@@ -0,0 +1,68 @@
+# app/gunicorn_conf.py
+"""
+Production server: a gunicorn master supervising uvicorn workers.
+
+    gunicorn -c python:app.gunicorn_conf app.main:app
+
+Everything is driven by Settings (SERVER_*, WEB_CONCURRENCY, DB_MAX_CONNECTIONS).
+Signals to the master:
+- HUP: start fresh workers, then stop the old ones once their requests drain
+  (with SERVER_PRELOAD_APP the code is not re-imported; restart the master or
+  disable preloading to roll out new code this way);
+- TERM: graceful stop, workers get ``graceful_timeout`` to finish;
+- TTIN / TTOU: one worker more / less.
+
+Per-process state with several workers: a memory response cache would only
+be invalidated in the worker that handled a write, so unless CACHE_BACKEND
+is set the cache is off (use redis to cache across workers). Cached
+token/user snapshots live TOKEN_REVOCATION_SYNC_SECONDS instead of 60s, the
+same bound as revocations made by another worker. Memory rate limits count
+per worker. The lifespan logs a warning for explicit per-process settings.
+"""
+import os
+
+from uvicorn_worker import UvicornWorker
+
+from app.core.config import get_settings
+from app.db.pool import get_pool_limits
+
+# resolve the worker count before the app is loaded: Settings.worker_count, and with it the
+# cache defaults and the per-worker DB pool share, follow WEB_CONCURRENCY
+os.environ["WEB_CONCURRENCY"] = str(get_settings().WEB_CONCURRENCY or os.cpu_count() or 1)
+get_settings.cache_clear()
+_settings = get_settings()
+
+bind = _settings.SERVER_BIND
+workers = _settings.worker_count
+worker_class = "app.gunicorn_conf.Worker"
+preload_app = _settings.SERVER_PRELOAD_APP
+keepalive = _settings.SERVER_KEEPALIVE_SECONDS
+timeout = _settings.SERVER_WORKER_TIMEOUT_SECONDS
+# the worker drains in-flight requests for SHUTDOWN_DRAIN_TIMEOUT_SECONDS, then runs lifespan
+# shutdown; leave it room for that before SIGKILL
+graceful_timeout = int(_settings.SHUTDOWN_DRAIN_TIMEOUT_SECONDS) + 5
+max_requests = _settings.SERVER_MAX_REQUESTS
+max_requests_jitter = _settings.SERVER_MAX_REQUESTS_JITTER if _settings.SERVER_MAX_REQUESTS else 0
+accesslog = "-" if _settings.SERVER_ACCESS_LOG else None
+errorlog = "-"
+loglevel = _settings.LOG_LEVEL.lower()
+
+
+class Worker(UvicornWorker):
+    CONFIG_KWARGS = {
+        "loop": _settings.SERVER_LOOP,
+        "http": _settings.SERVER_HTTP,
+        "lifespan": "on",  # a failed startup kills the worker instead of serving half-initialized
+        "access_log": _settings.SERVER_ACCESS_LOG,
+        # on TERM: stop accepting, then wait this long for running requests before cancelling them
+        "timeout_graceful_shutdown": _settings.SHUTDOWN_DRAIN_TIMEOUT_SECONDS,
+    }
+
+
+def on_starting(server) -> None:
+    pool_size, max_overflow = get_pool_limits(_settings)
+    server.log.info(
+        "%d workers, DB pool per engine per worker: %d + %d overflow", workers, pool_size, max_overflow
+    )
+    if _settings.DB_MAX_CONNECTIONS and _settings.DB_MAX_CONNECTIONS < workers * (2 if _settings.DB_ASYNC else 1):
+        server.log.warning("DB_MAX_CONNECTIONS=%d is below one connection per engine per worker", _settings.DB_MAX_CONNECTIONS)
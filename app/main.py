@@ -1,16 +1,36 @@
-import logging
+from app.core.startup_profile import startup_profile  # first: starts the import clock
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.health import router as health_router
+from app.api.internal import router as internal_router
+from app.api.metrics import router as metrics_router
 from app.api.v1 import api_v1
-from app.db.base import init_db
+from app.core.lifespan import lifespan
 from app.middlewares.api_secret_middleware import APIKeyMiddleware
+from app.middlewares.in_flight_middleware import InFlightMiddleware
+from app.middlewares.metrics_middleware import MetricsMiddleware
+from app.middlewares.query_counter_middleware import QueryCounterMiddleware
+from app.middlewares.rate_limit_middleware import RateLimitMiddleware
 
 app = FastAPI(
     title="Planner API",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 app.include_router(api_v1)
+app.include_router(internal_router)
+app.include_router(health_router)
+app.include_router(metrics_router)
+
+# Per-request SQL statement count / DB time (Server-Timing header + log record)
+app.add_middleware(QueryCounterMiddleware)
+
+# 429 before routing: throttled logins never reach the DB or bcrypt. Inside CORS
+# so browsers can read the 429, inside APIKeyMiddleware so only keyed calls count.
+app.add_middleware(RateLimitMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -32,17 +52,10 @@ app.add_middleware(
 # 5. Browser: "OK, now I'll send the real POST with X-API-Secret"
 app.add_middleware(APIKeyMiddleware)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-
+# Request count / latency per route template; outside the API key check so 403s are counted too
+app.add_middleware(MetricsMiddleware)
 
-@app.on_event("startup")
-def on_startup():
-    init_db()  # ← tables are created here
+# Added last = outermost: counts every request for the in-flight gauge
+app.add_middleware(InFlightMiddleware)
 
-# @app.on_event("shutdown")
-# def on_shutdown():
-#     drop_db()
+startup_profile.mark_imported()
@@ -1,56 +1,82 @@
 # middlewares/api_secret_middleware.py
 import hashlib
 import hmac
+import logging
+from typing import Iterable, Optional
 
-from fastapi import Request, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import status
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from app.core.security import logger, settings
+from app.core.config import get_settings
 
+logger = logging.getLogger(__name__)
 
-class APIKeyMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, excluded_paths=None):
-        super().__init__(app)
-        self.excluded_paths = excluded_paths or ["/docs", "/redoc", "/openapi.json", "/health"]
 
-    async def dispatch(self, request: Request, call_next):
-        """
-        Validate API key for all requests except:
-        1. OPTIONS requests (CORS preflight)
-        2. Explicitly excluded paths
-        """
-        logger.debug(f"{request.method} {request.url.path}")
+class APIKeyMiddleware:
+    """
+    Validate the API secret header for all requests except:
+    1. OPTIONS requests (CORS preflight)
+    2. Explicitly excluded paths
+
+    Plain ASGI middleware: the request is handed to the app untouched, so
+    streaming responses pass straight through. Digests of the accepted keys
+    are computed once; several keys may be active while rotating.
+    """
+
+    def __init__(self, app: ASGIApp, excluded_paths: Optional[Iterable[str]] = None, api_keys: Optional[Iterable[str]] = None):
+        settings = get_settings()
+        self.app = app
+        self.excluded_paths = frozenset(excluded_paths or ["/docs", "/redoc", "/openapi.json", "/health", "/ready", "/metrics"])
+        self.header_name = settings.API_SECRET_HEADER_NAME.lower().encode("latin-1")
+        if api_keys is None:
+            api_keys = [settings.API_SECRET_KEY, *settings.API_SECRET_ROTATING_KEYS]
+        self.expected_hashes = tuple(hashlib.sha256(key.encode()).digest() for key in api_keys if key)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s %s", scope["method"], scope["path"])
 
         # ALWAYS let OPTIONS through - this is NOT a security risk
         # OPTIONS only checks if the actual request would be allowed
-        if request.method == "OPTIONS":
-            response = await call_next(request)
-            return response
-
-        # Skip validation for excluded paths
-        if request.url.path in self.excluded_paths:
-            return await call_next(request)
+        if scope["method"] == "OPTIONS" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
 
         # Now validate API key for all other requests
-        api_key = request.headers.get(settings.API_SECRET_HEADER_NAME)
+        api_key = None
+        for name, value in scope["headers"]:
+            if name == self.header_name:
+                api_key = value
+                break
 
         if not api_key:
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=status.HTTP_403_FORBIDDEN,
                 content={"detail": "API secret header missing"}
             )
+            await response(scope, receive, send)
+            return
 
-        # Secure hash comparison
-        provided_hash = hashlib.sha256(api_key.encode()).digest()
-        expected_hash = hashlib.sha256(settings.API_SECRET_KEY.encode()).digest()
-
-        if not hmac.compare_digest(provided_hash, expected_hash):
-            return JSONResponse(
+        if not self.is_valid_key(api_key):
+            response = JSONResponse(
                 status_code=status.HTTP_403_FORBIDDEN,
                 content={"detail": "Invalid API credentials"}
             )
+            await response(scope, receive, send)
+            return
 
         # Valid API key - proceed
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
+
+    def is_valid_key(self, api_key: bytes) -> bool:
+        """Secure hash comparison; every active key is compared to avoid timing leaks."""
+        provided_hash = hashlib.sha256(api_key).digest()
+        valid = False
+        for expected_hash in self.expected_hashes:
+            valid |= hmac.compare_digest(provided_hash, expected_hash)
+        return valid
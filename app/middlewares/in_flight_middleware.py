@@ -0,0 +1,36 @@
+# middlewares/in_flight_middleware.py
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class InFlightRequests:
+    """Number of HTTP requests currently being handled."""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self) -> None:
+        self.count += 1
+
+    def finished(self) -> None:
+        self.count -= 1
+
+
+in_flight = InFlightRequests()
+
+
+class InFlightMiddleware:
+    """Tracks requests in ``in_flight`` (including streamed bodies) for the in-flight gauge."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        in_flight.started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            in_flight.finished()
@@ -0,0 +1,60 @@
+# middlewares/query_counter_middleware.py
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.log_config import request_log_sampler
+from app.db.instrumentation import start_query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCounterMiddleware:
+    """
+    Count SQL statements and DB time per request.
+
+    Adds a ``Server-Timing: db;dur=<ms>;desc="<n> queries"`` header and logs
+    one structured record per request: DEBUG normally, WARNING when the query
+    budget or the repeated-statement threshold was hit. Statements issued
+    after the headers are sent (streaming bodies) are only in the log record.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = start_query_stats()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"')
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            level = logging.WARNING if stats.violations else logging.DEBUG
+            if logger.isEnabledFor(level) and (stats.violations or request_log_sampler.sample()):
+                route = scope.get("route")
+                logger.log(
+                    level,
+                    "%s %s: %d queries in %.2f ms%s",
+                    scope["method"],
+                    scope["path"],
+                    stats.count,
+                    stats.duration * 1000,
+                    "".join(f"; {violation}" for violation in stats.violations),
+                    extra={
+                        "method": scope["method"],
+                        "route": getattr(route, "path", scope["path"]),
+                        "db_queries": stats.count,
+                        "db_time_ms": round(stats.duration * 1000, 3),
+                        "db_violations": stats.violations,
+                    },
+                )
@@ -0,0 +1,119 @@
+# middlewares/rate_limit_middleware.py
+import hashlib
+import json
+import logging
+import math
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from fastapi import status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.core.metrics import rate_limited
+from app.core.rate_limit import Rate, RateLimitBackend, build_rate_limit_backend, parse_rate
+
+logger = logging.getLogger(__name__)
+
+# larger bodies are not parsed for a username; the per-IP bucket still applies
+MAX_PEEK_BODY = 16 * 1024
+
+
+class RateLimitMiddleware:
+    """
+    Sliding-window rate limits answered with 429 + Retry-After before routing,
+    so a throttled request never reaches the database or bcrypt.
+
+    Buckets:
+    - per API key, on every request (off unless RATE_LIMIT_PER_API_KEY is set);
+    - per client IP, on the auth endpoints;
+    - per username, on the auth endpoints; the username is read from the form
+      or JSON body, which is then replayed to the app unchanged.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            auth_paths: Optional[Iterable[str]] = None,
+            backend: Optional[RateLimitBackend] = None,
+    ):
+        settings = get_settings()
+        self.app = app
+        self.enabled = settings.RATE_LIMIT_ENABLED
+        self.auth_paths = frozenset(auth_paths or ["/api/v1/auth/login", "/api/v1/auth/token", "/api/v1/auth/register"])
+        self.backend = backend or build_rate_limit_backend()
+        self.per_api_key = parse_rate(settings.RATE_LIMIT_PER_API_KEY)
+        self.per_ip = parse_rate(settings.RATE_LIMIT_AUTH_PER_IP)
+        self.per_username = parse_rate(settings.RATE_LIMIT_AUTH_PER_USERNAME)
+        self.api_key_header = settings.API_SECRET_HEADER_NAME.lower().encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.enabled or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        buckets: List[Tuple[str, str, Rate]] = []
+        if self.per_api_key is not None:
+            # no key: a path excluded from the API key check (probes, /metrics), not throttled per key
+            api_key = next((value for name, value in scope["headers"] if name == self.api_key_header), None)
+            if api_key:
+                buckets.append(("key", hashlib.sha256(api_key).hexdigest()[:16], self.per_api_key))
+
+        if scope["path"] in self.auth_paths and scope["method"] == "POST":
+            if self.per_ip is not None and scope.get("client"):
+                buckets.append(("ip", scope["client"][0], self.per_ip))
+            if self.per_username is not None:
+                body, receive = await self._peek_body(receive)
+                username = _username_from_body(scope, body)
+                if isinstance(username, str) and username:
+                    buckets.append(("user", username.lower(), self.per_username))
+
+        for bucket, key, rate in buckets:
+            retry_after = await self.backend.hit(f"{bucket}:{key}", rate)
+            if retry_after:
+                logger.warning("Rate limit hit: %s bucket on %s %s", bucket, scope["method"], scope["path"])
+                rate_limited.inc(bucket)
+                response = JSONResponse(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    content={"detail": "Too many requests, please retry later"},
+                    headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+                )
+                await response(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _peek_body(receive: Receive) -> Tuple[bytes, Receive]:
+        """Read the request body up to MAX_PEEK_BODY and return a receive that replays it."""
+        messages: List[Message] = []
+        body = b""
+        more_body = True
+        while more_body and len(body) <= MAX_PEEK_BODY:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        async def replay() -> Message:
+            return messages.pop(0) if messages else await receive()
+
+        return (body if not more_body else b""), replay
+
+
+def _username_from_body(scope: Scope, body: bytes) -> Optional[str]:
+    if not body:
+        return None
+    content_type = next((value for name, value in scope["headers"] if name == b"content-type"), b"")
+    try:
+        if content_type.startswith(b"application/x-www-form-urlencoded"):
+            return parse_qs(body.decode()).get("username", [None])[0]
+        if content_type.startswith(b"application/json"):
+            data = json.loads(body)
+            return data.get("username") if isinstance(data, dict) else None
+    except (UnicodeDecodeError, ValueError):
+        return None
+    return None
@@ -0,0 +1,2 @@
+# every model module, so Base.metadata knows all tables (create_all, schema checks)
+from app.models import refresh_token, revoked_token, task, user  # noqa: F401
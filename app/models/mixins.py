@@ -0,0 +1,15 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, func
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class TimestampMixin:
+    # evaluated per row (a call, not datetime.now() at import); the server default covers raw SQL inserts
+    created_at = Column(DateTime(timezone=True), nullable=False, default=utcnow, server_default=func.now())
+    updated_at = Column(
+        DateTime(timezone=True), nullable=False, default=utcnow, server_default=func.now(), onupdate=utcnow
+    )
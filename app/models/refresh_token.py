@@ -0,0 +1,22 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from app.db.base import Base
+from app.models.mixins import utcnow
+
+
+class RefreshToken(Base):
+    """
+    One refresh token of a login session, stored as an HMAC of the token.
+
+    Every refresh revokes the presented token and issues a new one in the same
+    family; presenting a revoked token again means it leaked and the whole
+    family is revoked.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True)
+    token_hash = Column(String, nullable=False, unique=True, index=True)
+    family_id = Column(String, nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=utcnow)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from app.db.base import Base
+from app.models.mixins import utcnow
+
+
+class RevokedToken(Base):
+    """Access token revoked before its ``exp``; the row can go once the token has expired."""
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String, primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    # workers poll for rows revoked since their last sync
+    revoked_at = Column(DateTime(timezone=True), nullable=False, default=utcnow, index=True)
@@ -1,9 +1,63 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import DDL, Column, ForeignKey, Index, Integer, String, event, func, literal_column, text
 from app.db.base import Base
+from app.models.mixins import TimestampMixin
 
+# text search configuration of the title index; queries must use the very same expression
+TITLE_SEARCH_CONFIG = literal_column("'simple'::regconfig")
 
-class Task(Base):
+
+class Task(TimestampMixin, Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # per-user listing: every page is a range scan inside one owner's tasks
+        Index("ix_tasks_owner_id_id", "owner_id", "id"),
+        # incremental sync: "owner's tasks changed since X", keyset-paginated by (updated_at, id)
+        Index("ix_tasks_owner_id_updated_at_id", "owner_id", "updated_at", "id"),
+        # title search on Postgres, kept current by Postgres itself on every INSERT/UPDATE:
+        # ranked full text, plus trigrams for typos and partial words. owner_id leads (btree_gin),
+        # so a common word only reaches the owner's own matches, not every user's
+        Index(
+            "ix_tasks_owner_id_title_tsv",
+            "owner_id",
+            func.to_tsvector(TITLE_SEARCH_CONFIG, text("title")),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_tasks_owner_id_title_trgm",
+            "owner_id",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     title = Column(String, nullable=False)
+
+
+def title_tsvector():
+    """The expression indexed by ix_tasks_owner_id_title_tsv."""
+    return func.to_tsvector(TITLE_SEARCH_CONFIG, Task.title)
+
+
+# gin_trgm_ops comes from pg_trgm, GIN on the integer owner_id from btree_gin
+for extension in ("pg_trgm", "btree_gin"):
+    event.listen(
+        Task.__table__, "before_create", DDL(f"CREATE EXTENSION IF NOT EXISTS {extension}").execute_if(dialect="postgresql")
+    )
+
+# SQLite (local/test runs): an external-content FTS5 table over tasks.title, updated by triggers
+for statement in (
+    "CREATE VIRTUAL TABLE tasks_fts USING fts5("
+    "title, content='tasks', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title) VALUES (new.id, new.title); END",
+    "CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title) VALUES ('delete', old.id, old.title); END",
+    "CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title) VALUES ('delete', old.id, old.title); "
+    "INSERT INTO tasks_fts(rowid, title) VALUES (new.id, new.title); END",
+):
+    event.listen(Task.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(Task.__table__, "after_drop", DDL("DROP TABLE IF EXISTS tasks_fts").execute_if(dialect="sqlite"))
@@ -1,10 +1,14 @@
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Index
 from app.db.base import Base
+from app.models.mixins import TimestampMixin
 
 
-class User(Base):
+class User(TimestampMixin, Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # keyset pagination ordered by creation time
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -15,5 +19,3 @@ class User(Base):
     gender = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
     email_verified_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.now())
-    updated_at = Column(DateTime, default=datetime.now(), onupdate=datetime.now())
@@ -0,0 +1,116 @@
+# app/repositories/pagination.py
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, List, Optional, Sequence, TypeVar
+
+from sqlalchemy import DateTime, Select, literal, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.db.session import DBSession
+from app.schemas.pagination import SortOrder
+
+T = TypeVar("T")
+
+
+class InvalidCursorError(ValueError):
+    """Cursor is malformed or was issued for a different sort order."""
+
+
+@dataclass
+class KeysetPage(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str]
+
+
+def _signature(columns: Sequence[InstrumentedAttribute], order: SortOrder) -> str:
+    return ",".join(column.key for column in columns) + ":" + order
+
+
+def _encode(payload: dict) -> str:
+    data = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> dict:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def encode_cursor(row: Any, columns: Sequence[InstrumentedAttribute], order: SortOrder) -> str:
+    values = []
+    for column in columns:
+        value = getattr(row, column.key)
+        values.append(value.isoformat() if isinstance(value, datetime) else value)
+    return _encode({"s": _signature(columns, order), "k": values})
+
+
+def decode_cursor(cursor: str, columns: Sequence[InstrumentedAttribute], order: SortOrder) -> List[Any]:
+    try:
+        payload = _decode(cursor)
+        values = payload["k"]
+        signature = payload["s"]
+    except (ValueError, KeyError, TypeError):
+        raise InvalidCursorError("Malformed cursor")
+
+    if signature != _signature(columns, order) or len(values) != len(columns):
+        raise InvalidCursorError("Cursor does not match the requested sort order")
+
+    try:
+        return [
+            datetime.fromisoformat(value) if isinstance(column.type, DateTime) else value
+            for column, value in zip(columns, values)
+        ]
+    except (TypeError, ValueError):
+        raise InvalidCursorError("Malformed cursor")
+
+
+async def paginate(
+        db: DBSession,
+        stmt: Select,
+        columns: Sequence[InstrumentedAttribute],
+        order: SortOrder,
+        limit: int,
+        cursor: Optional[str] = None,
+) -> KeysetPage:
+    """
+    Keyset pagination over ``columns``, which must end with a unique column.
+
+    Rows after the cursor are found with a row-value comparison on the same
+    columns the statement is ordered by, so with a matching index each page
+    is an index range scan no matter how deep into the table it is.
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns, order)
+        bounds = [literal(value, column.type) for column, value in zip(columns, values)]
+        key, bound = (columns[0], bounds[0]) if len(columns) == 1 else (tuple_(*columns), tuple_(*bounds))
+        stmt = stmt.where(key > bound if order == "asc" else key < bound)
+
+    stmt = stmt.order_by(*(column.asc() if order == "asc" else column.desc() for column in columns))
+    rows = list((await db.scalars(stmt.limit(limit + 1))).all())
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1], columns, order)
+    return KeysetPage(items=rows, next_cursor=next_cursor)
+
+
+def encode_offset_cursor(offset: int, signature: str) -> str:
+    """Cursor for result sets ordered by a computed value (e.g. search rank) that keysets cannot follow."""
+    return _encode({"s": signature, "o": offset})
+
+
+def decode_offset_cursor(cursor: str, signature: str) -> int:
+    try:
+        payload = _decode(cursor)
+        offset = payload["o"]
+        matches = payload["s"] == signature
+    except (ValueError, KeyError, TypeError):
+        raise InvalidCursorError("Malformed cursor")
+    if not matches:
+        raise InvalidCursorError("Cursor does not match the requested sort order")
+    if not isinstance(offset, int) or offset < 0:
+        raise InvalidCursorError("Malformed cursor")
+    return offset
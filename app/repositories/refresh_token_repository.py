@@ -0,0 +1,65 @@
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import delete, select, update
+
+from app.db.routing import pin_primary
+from app.db.session import DBSession
+from app.models.mixins import utcnow
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+
+class RefreshTokenRepository:
+    def __init__(self, db: DBSession):
+        self.db = db
+
+    async def create(self, user_id: int, token_hash: str, family_id: str, expires_at: datetime) -> None:
+        self.db.add(RefreshToken(user_id=user_id, token_hash=token_hash, family_id=family_id, expires_at=expires_at))
+        await self.db.commit()
+
+    async def get_with_username(self, token_hash: str, now: datetime) -> Optional[Tuple[RefreshToken, str]]:
+        """Unexpired token by hash plus its user's name, in one indexed lookup."""
+        # a rotation may have been written a moment ago; replicas could still miss it
+        pin_primary(self.db)
+        stmt = (
+            select(RefreshToken, User.username)
+            .join(User, User.id == RefreshToken.user_id)
+            .where(RefreshToken.token_hash == token_hash, RefreshToken.expires_at > now)
+        )
+        row = (await self.db.execute(stmt)).first()
+        return None if row is None else (row[0], row[1])
+
+    async def rotate(self, token: RefreshToken, new_hash: str, expires_at: datetime) -> bool:
+        """
+        Revoke ``token`` and add its successor in one transaction.
+
+        The revoke is conditional, so of two concurrent refreshes with the same
+        token only one wins; the loser gets False.
+        """
+        revoked = await self.db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.id == token.id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=utcnow())
+        )
+        if revoked.rowcount != 1:
+            await self.db.rollback()
+            return False
+        self.db.add(RefreshToken(
+            user_id=token.user_id, token_hash=new_hash, family_id=token.family_id, expires_at=expires_at
+        ))
+        await self.db.commit()
+        return True
+
+    async def revoke_family(self, family_id: str) -> None:
+        await self.db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=utcnow())
+        )
+        await self.db.commit()
+
+    async def delete_expired(self, now: datetime) -> int:
+        result = await self.db.execute(delete(RefreshToken).where(RefreshToken.expires_at <= now))
+        await self.db.commit()
+        return result.rowcount
@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import delete, select
+
+from app.db.routing import pin_primary
+from app.db.session import DBSession
+from app.models.revoked_token import RevokedToken
+
+
+class RevokedTokenRepository:
+    def __init__(self, db: DBSession):
+        self.db = db
+
+    async def add(self, jti: str, user_id: int, expires_at: datetime) -> None:
+        pin_primary(self.db)
+        if await self.db.get(RevokedToken, jti) is None:
+            self.db.add(RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at))
+            await self.db.commit()
+
+    async def list_active(self, now: datetime, revoked_since: Optional[datetime] = None) -> List[Tuple[str, datetime]]:
+        """(jti, expires_at) of unexpired revocations, optionally only those revoked since a time."""
+        # replicas may lag behind a revocation that was just written
+        pin_primary(self.db)
+        stmt = select(RevokedToken.jti, RevokedToken.expires_at).where(RevokedToken.expires_at > now)
+        if revoked_since is not None:
+            stmt = stmt.where(RevokedToken.revoked_at >= revoked_since)
+        return [tuple(row) for row in (await self.db.execute(stmt)).all()]
+
+    async def delete_expired(self, now: datetime) -> int:
+        result = await self.db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        await self.db.commit()
+        return result.rowcount
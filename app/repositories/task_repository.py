@@ -1,20 +1,176 @@
-from sqlalchemy.orm import Session
-from app.models.task import Task
-from typing import Optional, List
+import re
+
+from sqlalchemy import Row, Select, func, insert, literal, literal_column, select, table, column, update
+
+from app.core.cache import response_cache
+from app.db.routing import pin_primary
+from app.db.session import DBSession
+from app.models.task import TITLE_SEARCH_CONFIG, Task, title_tsvector
+from app.repositories.pagination import (
+    InvalidCursorError, KeysetPage, decode_offset_cursor, encode_offset_cursor, paginate
+)
+from app.schemas.pagination import SortOrder
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional, List, Sequence, Tuple
+
+# SQLite full-text table maintained by triggers (see app/models/task.py)
+tasks_fts = table("tasks_fts", column("rowid"), column("rank"))
+
+SEARCH_WORD = re.compile(r"\w+")
+
 
 class TaskRepository:
-    def __init__(self, db: Session):
+    """Tasks of a single owner; other users' tasks behave as if they did not exist."""
+
+    def __init__(self, db: DBSession, owner_id: int):
         self.db = db
+        self.owner_id = owner_id
+
+    async def get(self, task_id: int) -> Optional[Task]:
+        task = await self.db.get(Task, task_id)
+        return task if task is not None and task.owner_id == self.owner_id else None
+
+    async def list(
+            self,
+            limit: int,
+            cursor: Optional[str] = None,
+            order: SortOrder = "asc",
+            updated_since: Optional[datetime] = None,
+    ) -> KeysetPage[Task]:
+        """
+        Tasks by id, or with ``updated_since`` the tasks changed at or after it,
+        ordered by (updated_at, id) so the delta is an index range scan.
+        """
+        stmt = select(Task).where(Task.owner_id == self.owner_id)
+        if updated_since is None:
+            return await paginate(self.db, stmt, [Task.id], order, limit, cursor)
+        stmt = stmt.where(Task.updated_at >= updated_since)
+        return await paginate(self.db, stmt, [Task.updated_at, Task.id], order, limit, cursor)
+
+    async def search(
+            self, query: str, limit: int, cursor: Optional[str] = None, max_results: int = 1000
+    ) -> KeysetPage[Task]:
+        """
+        Tasks whose title matches ``query``, best match first, down to ``max_results``.
+
+        Postgres: full-text match ranked by ts_rank_cd; when that finds
+        nothing, trigram word similarity, which tolerates typos and partial
+        words. Both indexes lead with owner_id, so only the owner's matches
+        are read. SQLite (local/test): FTS5 prefix match on every word, ranked
+        by bm25; the FTS table is not per owner, so matches of all users are
+        read and then filtered.
 
-    def get(self, task_id: int) -> Optional[Task]:
-        return self.db.query(Task).filter(Task.id == task_id).first()
+        Tradeoff: ranking sorts all of the owner's matches for every page, and
+        pages are OFFSET-based because the order is a computed rank, so a page
+        costs O(owner's matches) rather than O(page). Hence the result depth
+        cap: the offset, and the rescan it causes, never exceeds ``max_results``.
+        """
+        mode, offset = _search_position(cursor)
+        if offset >= max_results:
+            raise InvalidCursorError(f"Search results are limited to the first {max_results}")
+        limit = min(limit, max_results - offset)
+        if self.db.sync_session.bind.dialect.name != "postgresql":
+            return await self._search_page(self._sqlite_search(query), mode, limit, offset, max_results)
 
-    def list(self) -> list[type[Task]]:
-        return self.db.query(Task).all()
+        page = await self._search_page(self._postgres_search(query, mode), mode, limit, offset, max_results)
+        if not page.items and mode == "fulltext" and offset == 0:
+            page = await self._search_page(self._postgres_search(query, "trigram"), "trigram", limit, 0, max_results)
+        return page
 
-    def create(self, title: str) -> Task:
-        db_task = Task(title=title)
+    def _postgres_search(self, query: str, mode: str) -> Select:
+        stmt = select(Task).where(Task.owner_id == self.owner_id)
+        if mode == "trigram":
+            # "<%": some word of the title is similar to the query (uses ix_tasks_owner_id_title_trgm)
+            stmt = stmt.where(literal(query).op("<%")(Task.title))
+            return stmt.order_by(func.word_similarity(query, Task.title).desc(), Task.id.desc())
+        tsquery = func.websearch_to_tsquery(TITLE_SEARCH_CONFIG, query)
+        stmt = stmt.where(title_tsvector().op("@@")(tsquery))
+        return stmt.order_by(func.ts_rank_cd(title_tsvector(), tsquery).desc(), Task.id.desc())
+
+    def _sqlite_search(self, query: str) -> Select:
+        # every word quoted (no FTS5 syntax from user input) and prefix-matched
+        match = " ".join(f'"{word}"*' for word in SEARCH_WORD.findall(query))
+        if not match:
+            return select(Task).where(literal(False))
+        return (
+            select(Task)
+            .join(tasks_fts, tasks_fts.c.rowid == Task.id)
+            .where(literal_column("tasks_fts").op("MATCH")(match), Task.owner_id == self.owner_id)
+            .order_by(tasks_fts.c.rank, Task.id.desc())
+        )
+
+    async def _search_page(
+            self, stmt: Select, mode: str, limit: int, offset: int, max_results: int
+    ) -> KeysetPage[Task]:
+        rows = list((await self.db.scalars(stmt.offset(offset).limit(limit + 1))).all())
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            if offset + limit < max_results:
+                next_cursor = encode_offset_cursor(offset + limit, f"search:{mode}")
+        return KeysetPage(items=rows, next_cursor=next_cursor)
+
+    async def stream(self, batch_size: int) -> AsyncIterator[Sequence[Task]]:
+        """All tasks of the owner in id order, fetched in batches through a server-side cursor."""
+        stmt = select(Task).where(Task.owner_id == self.owner_id).order_by(Task.id).execution_options(yield_per=batch_size)
+        result = await self.db.stream_scalars(stmt)
+        async for partition in result.partitions():
+            yield partition
+
+    async def create(self, title: str) -> Task:
+        db_task = Task(title=title, owner_id=self.owner_id)
         self.db.add(db_task)
-        self.db.commit()
-        self.db.refresh(db_task)
+        await self.db.commit()
+        await self.db.refresh(db_task)
+        await response_cache.bump(f"tasks:{self.owner_id}")
         return db_task
+
+    async def create_many(self, titles: Sequence[str]) -> List[Row]:
+        """
+        Insert all tasks in one transaction with multi-row INSERT ... RETURNING.
+
+        Returns plain rows in input order; ORM objects would be expired by the
+        commit and reloaded one by one.
+        """
+        if not titles:
+            return []
+        stmt = insert(Task).returning(*Task.__table__.c, sort_by_parameter_order=True)
+        params = [{"title": title, "owner_id": self.owner_id} for title in titles]
+        rows = list((await self.db.execute(stmt, params)).all())
+        await self.db.commit()
+        await response_cache.bump(f"tasks:{self.owner_id}")
+        return rows
+
+    async def update_many(self, values: Sequence[Dict[str, Any]]) -> Dict[int, Row]:
+        """
+        Apply per-row changes (each dict holds ``id`` plus changed columns) in one transaction.
+
+        Runs one executemany UPDATE and returns the updated rows by id; ids that do
+        not exist or belong to another owner are skipped and missing from the result.
+        """
+        ids = {item["id"] for item in values}
+        if not ids:
+            return {}
+        pin_primary(self.db)
+        existing = set((await self.db.scalars(
+            select(Task.id).where(Task.owner_id == self.owner_id, Task.id.in_(ids))
+        )).all())
+        changes = [item for item in values if item["id"] in existing and len(item) > 1]
+        if changes:
+            await self.db.execute(update(Task), changes)
+        rows = (await self.db.execute(select(*Task.__table__.c).where(Task.id.in_(existing)))).all()
+        await self.db.commit()
+        if changes:
+            await response_cache.delete(*(f"task:{self.owner_id}:{task_id}" for task_id in existing))
+            await response_cache.bump(f"tasks:{self.owner_id}")
+        return {row.id: row for row in rows}
+
+
+def _search_position(cursor: Optional[str]) -> Tuple[str, int]:
+    """(mode, offset) of a search cursor; a trigram fallback keeps paging in trigram mode."""
+    if not cursor:
+        return "fulltext", 0
+    try:
+        return "trigram", decode_offset_cursor(cursor, "search:trigram")
+    except InvalidCursorError:
+        return "fulltext", decode_offset_cursor(cursor, "search:fulltext")
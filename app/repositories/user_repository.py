@@ -1,32 +1,60 @@
-from typing import Optional
+from typing import AsyncIterator, Optional, Sequence
 
 from fastapi import Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 
-from app.db.session import get_db
+from app.db.routing import pin_primary
+from app.db.session import DBSession, get_db
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash
+from app.repositories.pagination import KeysetPage, paginate
+from app.schemas.pagination import SortOrder
+from app.schemas.user import UserCreate, UserUpdate, UserSortField
+from app.core.security import get_password_hash_async
+from app.core.token_cache import token_cache
+from app.core.cache import response_cache
+
+# keyset columns per sort field, always ending with the unique id
+USER_SORT_COLUMNS = {
+    "id": (User.id,),
+    "created_at": (User.created_at, User.id),
+}
 
 class UserRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: DBSession):
         self.db = db
 
-    def get_by_id(self, user_id: int) -> Optional[User]:
-        return self.db.query(User).filter(User.id == user_id).first()
-
-    def get_by_email(self, email: str) -> Optional[User]:
-        return self.db.query(User).filter(User.email == email).first()
-
-    def get_by_username(self, username: str) -> Optional[User]:
-        return self.db.query(User).filter(User.username == username).first()
-
-    def list(self) -> list[type[User]]:
-        return self.db.query(User).all()
-
-    def create(self, user_in: UserCreate) -> User:
-        # Hash password before storing
-        hashed_password = get_password_hash(user_in.password)
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        return await self.db.get(User, user_id)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self.db.scalar(select(User).where(User.email == email).limit(1))
+
+    async def get_by_username(self, username: str) -> Optional[User]:
+        return await self.db.scalar(select(User).where(User.username == username).limit(1))
+
+    async def list(
+            self,
+            limit: int,
+            cursor: Optional[str] = None,
+            sort: UserSortField = "id",
+            order: SortOrder = "asc",
+            is_active: Optional[bool] = None,
+    ) -> KeysetPage[User]:
+        stmt = select(User)
+        if is_active is not None:
+            stmt = stmt.where(User.is_active == is_active)
+        return await paginate(self.db, stmt, USER_SORT_COLUMNS[sort], order, limit, cursor)
+
+    async def stream(self, batch_size: int) -> AsyncIterator[Sequence[User]]:
+        """All users in id order, fetched in batches through a server-side cursor."""
+        stmt = select(User).order_by(User.id).execution_options(yield_per=batch_size)
+        result = await self.db.stream_scalars(stmt)
+        async for partition in result.partitions():
+            yield partition
+
+    async def create(self, user_in: UserCreate) -> User:
+        # Hash password before storing (bcrypt is CPU bound, keep it off the event loop)
+        hashed_password = await get_password_hash_async(user_in.password)
 
         db_user = User(
             name=user_in.name,
@@ -38,12 +66,14 @@ class UserRepository:
             is_active=True
         )
         self.db.add(db_user)
-        self.db.commit()
-        self.db.refresh(db_user)
+        await self.db.commit()
+        await self.db.refresh(db_user)
         return db_user
 
-    def update(self, user_id: int, user_in: UserUpdate) -> Optional[User]:
-        db_user = self.get_by_id(user_id)
+    async def update(self, user_id: int, user_in: UserUpdate) -> Optional[User]:
+        # read-modify-write: a lagging replica could hand back a stale row
+        pin_primary(self.db)
+        db_user = await self.get_by_id(user_id)
         if not db_user:
             return None
 
@@ -51,22 +81,28 @@ class UserRepository:
 
         # Hash password if it's being updated
         if "password" in update_data:
-            update_data["password"] = get_password_hash(update_data.pop("password"))
+            update_data["password"] = await get_password_hash_async(update_data.pop("password"))
 
         for field, value in update_data.items():
             setattr(db_user, field, value)
 
-        self.db.commit()
-        self.db.refresh(db_user)
+        await self.db.commit()
+        await self.db.refresh(db_user)
+        # cached token snapshots and responses of this user are stale now
+        token_cache.invalidate_user(user_id)
+        await response_cache.delete(f"user:{user_id}")
         return db_user
 
-    def delete(self, user_id: int) -> bool:
-        db_user = self.get_by_id(user_id)
+    async def delete(self, user_id: int) -> bool:
+        pin_primary(self.db)
+        db_user = await self.get_by_id(user_id)
         if not db_user:
             return False
-        self.db.delete(db_user)
-        self.db.commit()
+        await self.db.delete(db_user)
+        await self.db.commit()
+        token_cache.invalidate_user(user_id)
+        await response_cache.delete(f"user:{user_id}")
         return True
 
-def get_user_repository(db: Session = Depends(get_db)) -> UserRepository:
+def get_user_repository(db: DBSession = Depends(get_db)) -> UserRepository:
     return UserRepository(db)
\ No newline at end of file
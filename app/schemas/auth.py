@@ -1,6 +1,6 @@
 # app/schemas/auth.py
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from pydantic import BaseModel, field_validator
 
@@ -12,6 +12,7 @@ class TokenData(BaseModel):
     username: str
     user_id: int
     expires_at: datetime
+    jti: Optional[str] = None  # absent on tokens issued before revocation support
 
 
 class TokenRead(BaseModel):
@@ -27,6 +28,7 @@ class TokenRead(BaseModel):
 class LoginResponse(BaseModel):
     token: TokenRead
     user: UserRead
+    refresh_token: Optional[TokenRead] = None
 
     @field_validator('token', mode='before')
     def validate_token(cls, v):
@@ -39,10 +41,19 @@ class LoginResponse(BaseModel):
 class RegisteredResponse(BaseModel):
     token: TokenRead
     user: UserRead
+    refresh_token: Optional[TokenRead] = None
 
     @field_validator('token', mode='before')
     def validate_token(cls, v):
         """Convert dict to TokenRead if needed."""
         if isinstance(v, dict):
             return TokenRead(**v)
-        return v
\ No newline at end of file
+        return v
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+class RefreshResponse(BaseModel):
+    token: TokenRead
+    refresh_token: TokenRead
@@ -0,0 +1,14 @@
+# app/schemas/pagination.py
+from typing import Generic, List, Literal, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+SortOrder = Literal["asc", "desc"]
+
+
+class Page(BaseModel, Generic[T]):
+    """One keyset page; pass ``next_cursor`` back as ``cursor`` to get the next one."""
+    items: List[T]
+    next_cursor: Optional[str] = None
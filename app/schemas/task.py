@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import Any, List, Optional
+
 from pydantic import BaseModel
 
 
@@ -9,8 +12,29 @@ class TaskCreate(TaskBase):
     pass
 
 
+class TaskUpdate(BaseModel):
+    title: Optional[str] = None
+
+
+class TaskBulkUpdate(TaskUpdate):
+    id: int
+
+
 class TaskRead(TaskBase):
     id: int
+    owner_id: int
+    created_at: datetime
+    updated_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class BulkItemError(BaseModel):
+    index: int
+    detail: Any
+
+
+class TaskBulkResult(BaseModel):
+    items: List[TaskRead]
+    errors: List[BulkItemError]
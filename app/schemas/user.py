@@ -1,8 +1,10 @@
 # app/schemas/user.py
 from pydantic import BaseModel, EmailStr, ConfigDict
-from typing import Optional
+from typing import Literal, Optional
 from datetime import datetime
 
+UserSortField = Literal["id", "created_at"]
+
 class UserBase(BaseModel):
     name: str
     lastname: str
@@ -1,16 +1,24 @@
 # services/auth_service.py
 import logging
-from typing import Union
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Tuple, Union
 
 from fastapi import Depends, HTTPException, status
 from jose import JWTError, ExpiredSignatureError
 from jose.exceptions import JWTClaimsError
-from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.core.security import verify_password, create_access_token, decode_token, oauth2_scheme
-from app.db.session import get_db
+from app.core.metrics import auth_failures
+from app.core.security import (
+    verify_password_async, create_access_token, create_refresh_token, decode_token, hash_refresh_token, oauth2_scheme
+)
+from app.core.revocation import revocation_list
+from app.core.token_cache import CachedToken, token_cache
+from app.db.session import DBSession, get_db
 from app.models.user import User
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.repositories.revoked_token_repository import RevokedTokenRepository
 from app.repositories.user_repository import UserRepository
 from app.schemas.auth import TokenData
 from app.schemas.user import UserCreate, UserRead
@@ -19,30 +27,32 @@ logger = logging.getLogger(__name__)
 
 
 class AuthService:
-    def __init__(self, db: Session):
+    def __init__(self, db: DBSession):
         self.db = db
         self.user_repository = UserRepository(db)
         self.settings = get_settings()
 
-    def register_user(self, user_in: UserCreate) -> User:
+    async def register_user(self, user_in: UserCreate) -> User:
         """Register a new user."""
-        existing_user = self.user_repository.get_by_username(user_in.username)
+        existing_user = await self.user_repository.get_by_username(user_in.username)
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already registered"
             )
-        return self.user_repository.create(user_in)
+        return await self.user_repository.create(user_in)
 
-    def authenticate_user(self, username: str, password: str) -> User:
+    async def authenticate_user(self, username: str, password: str) -> User:
         """Authenticate user with username and password."""
-        user = self.user_repository.get_by_username(username)
+        user = await self.user_repository.get_by_username(username)
         if not user:
+            auth_failures.inc("unknown_user")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"User with username {username} not found"
             )
-        if not verify_password(password, user.password):
+        if not await verify_password_async(password, user.password):
+            auth_failures.inc("bad_password")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect password",
@@ -61,21 +71,64 @@ class AuthService:
             "user_id": user_id,
         })
 
-    def get_current_user(self, token: str = Depends(oauth2_scheme)) -> User:
-        """Get current user from JWT token."""
-        token_data = self.validate_and_get_token_data(token)
-        user = self.user_repository.get_by_username(token_data.username)
+    async def issue_refresh_token(self, user_id: int) -> str:
+        """Start a new login session (refresh token family) for the user."""
+        token = create_refresh_token()
+        await RefreshTokenRepository(self.db).create(
+            user_id, hash_refresh_token(token), family_id=uuid.uuid4().hex, expires_at=self._refresh_expiry()
+        )
+        return token
 
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials or user do not exists",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+    async def refresh(self, refresh_token: str) -> Tuple[str, str]:
+        """
+        Exchange a refresh token for a new access token and a new refresh token.
 
-        return user
+        Costs an HMAC and one indexed lookup instead of a bcrypt verify. A
+        token that was already rotated is treated as stolen: its whole family
+        is revoked and the client has to log in again.
+        """
+        repository = RefreshTokenRepository(self.db)
+        found = await repository.get_with_username(hash_refresh_token(refresh_token), datetime.now(timezone.utc))
+        if found is None:
+            auth_failures.inc("invalid_refresh_token")
+            raise self._invalid_refresh_token()
+        stored, username = found
+
+        new_token = create_refresh_token()
+        if stored.revoked_at is not None or not await repository.rotate(
+                stored, hash_refresh_token(new_token), self._refresh_expiry()
+        ):
+            logger.warning("Refresh token reuse for user %s, revoking the session", stored.user_id)
+            await repository.revoke_family(stored.family_id)
+            auth_failures.inc("refresh_token_reuse")
+            raise self._invalid_refresh_token()
+
+        access_token = create_access_token({"username": username, "user_id": stored.user_id})
+        return access_token, new_token
+
+    async def revoke_refresh_token(self, refresh_token: str) -> None:
+        """End the login session of a refresh token (no error if it is unknown)."""
+        repository = RefreshTokenRepository(self.db)
+        found = await repository.get_with_username(hash_refresh_token(refresh_token), datetime.now(timezone.utc))
+        if found is not None:
+            await repository.revoke_family(found[0].family_id)
 
-    def get_current_active_user(self, current_user: User = Depends(get_current_user)) -> User:
+    def _refresh_expiry(self) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(days=self.settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
+    @staticmethod
+    def _invalid_refresh_token() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    async def get_current_user(self, token: str = Depends(oauth2_scheme)) -> UserRead:
+        """Get current user from JWT token - useful for other endpoints."""
+        return (await self.resolve_token(token)).user
+
+    async def get_current_active_user(self, current_user: UserRead = Depends(get_current_user)) -> UserRead:
         """Get current active user."""
         if not current_user.is_active:
             raise HTTPException(
@@ -84,40 +137,59 @@ class AuthService:
             )
         return current_user
 
-    def validate_and_get_token_data(self, token: str) -> TokenData:
+    async def validate_and_get_token_data(self, token: str) -> TokenData:
         """Validate token and return token data if valid."""
+        return (await self.resolve_token(token)).token_data
+
+    async def resolve_token(self, token: str) -> CachedToken:
+        """
+        Validate token and load its user, served from the token cache when possible.
+
+        A cache hit skips both the signature check and the user lookup; the
+        revocation check is an in-memory lookup on both paths.
+        """
         # First validate the token format
         self.validate_token_format(token)
 
+        cached = token_cache.get(token)
+        if cached is not None:
+            self.check_not_revoked(cached.token_data)
+            return cached
+
         # Then decode and validate token content
         try:
             # decode_token should return the decoded payload
             token_payload = decode_token(token)
+            self.check_not_revoked(token_payload)
 
             # Verify user exists
-            user = self.user_repository.get_by_username(token_payload.username)
+            user = await self.user_repository.get_by_username(token_payload.username)
             if user is None:
+                auth_failures.inc("unknown_user")
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="User not found or inactive",
                     headers={"WWW-Authenticate": "Bearer"},
                 )
 
-            return token_payload
+            return token_cache.put(token, token_payload, UserRead.model_validate(user))
 
         except ExpiredSignatureError:
+            auth_failures.inc("expired_token")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token has expired. Please login again to get a new token.",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         except JWTClaimsError:
+            auth_failures.inc("invalid_claims")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token claims",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         except JWTError:
+            auth_failures.inc("invalid_token")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token or secret key",
@@ -127,16 +199,40 @@ class AuthService:
             # Re-raise HTTP exceptions (like user not found)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error validating token: {str(e)}")
+            logger.error("Unexpected error validating token: %s", e)
+            auth_failures.inc("invalid_token")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate token",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+    async def revoke_token(self, token: str) -> None:
+        """Revoke a valid token so it is rejected from now on (logout)."""
+        token_data = (await self.resolve_token(token)).token_data
+        if token_data.jti is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Token cannot be revoked, please login again",
+            )
+        await revocation_list.revoke(
+            RevokedTokenRepository(self.db), token_data.jti, token_data.user_id, token_data.expires_at
+        )
+
+    @staticmethod
+    def check_not_revoked(token_data: TokenData) -> None:
+        if revocation_list.is_revoked(token_data.jti):
+            auth_failures.inc("revoked_token")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
     def validate_token_format(self, token: str):
         """Validate token format before attempting to decode."""
         if token is None:
+            auth_failures.inc("missing_token")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Authorization header is required",
@@ -144,6 +240,7 @@ class AuthService:
             )
 
         if not isinstance(token, str):
+            auth_failures.inc("malformed_token")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token must be a string",
@@ -152,24 +249,21 @@ class AuthService:
 
         # Handle empty string, whitespace-only strings, and string "null"/"none"
         if not token.strip() or token.lower() in ["null", "none"]:
+            auth_failures.inc("missing_token")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Missing or invalid authorization token",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-    def get_current_user(self, token: str = Depends(oauth2_scheme)) -> User:
-        """Get current user from token - useful for other endpoints."""
-        token_data = self.validate_and_get_token_data(token)
-        user = self.user_repository.get_by_username(token_data.username)
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        return user
 
-
-def get_auth_service(db: Session = Depends(get_db)) -> AuthService:
+def get_auth_service(db: DBSession = Depends(get_db)) -> AuthService:
     return AuthService(db)
+
+
+async def get_authenticated_user(
+        token: str = Depends(oauth2_scheme),
+        auth_service: AuthService = Depends(get_auth_service),
+) -> UserRead:
+    """Dependency: the user of the bearer token (401 otherwise)."""
+    return await auth_service.get_current_user(token)
@@ -0,0 +1,45 @@
+# app/services/export_service.py
+from typing import Any, AsyncIterator, Callable, Literal, Type
+
+from pydantic import BaseModel
+
+from app.core.config import get_settings
+from app.db.session import DBSession, session_scope
+
+ExportFormat = Literal["ndjson", "json"]
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+
+
+async def export_rows(
+        repository: Callable[[DBSession], Any], schema: Type[BaseModel], fmt: ExportFormat
+) -> AsyncIterator[bytes]:
+    """
+    Stream every row of a repository as NDJSON lines or one chunked JSON array.
+
+    ``repository`` builds the repository for the export session: a repository
+    class, or a callable binding extra arguments such as the task owner.
+
+    Opens its own session: the request session is closed before a streaming
+    body starts. One chunk is emitted per fetched batch, so memory stays at a
+    single batch whatever the table size.
+    """
+    batch_size = get_settings().EXPORT_BATCH_SIZE
+    separator = b"\n" if fmt == "ndjson" else b","
+    first = True
+
+    if fmt == "json":
+        yield b"["
+    async with session_scope() as db:
+        async for rows in repository(db).stream(batch_size):
+            chunk = separator.join(schema.model_validate(row).model_dump_json().encode() for row in rows)
+            if fmt == "ndjson":
+                yield chunk + b"\n"
+            else:
+                yield chunk if first else b"," + chunk
+            first = False
+    if fmt == "json":
+        yield b"]"
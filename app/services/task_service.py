@@ -1,28 +1,107 @@
+import json
+from datetime import datetime, timezone
+
+from fastapi import HTTPException, status
 from fastapi.params import Depends
-from sqlalchemy.orm import Session
+from pydantic import ValidationError
 
-from app.db.session import get_db
+from app.core.config import get_settings
+from app.db.session import DBSession, get_db
+from app.repositories.pagination import InvalidCursorError
 from app.repositories.task_repository import TaskRepository
-from app.schemas.task import TaskCreate, TaskRead
-from typing import Optional, List
+from app.schemas.pagination import Page, SortOrder
+from app.schemas.task import TaskCreate, TaskRead, TaskBulkUpdate, TaskBulkResult, BulkItemError
+from typing import Any, Optional, List
 
 from app.schemas.user import UserRead
+from app.services.auth_service import get_authenticated_user
 
 
 class TaskService:
-    def __init__(self, db: Session):
-        self.repo = TaskRepository(db)
+    def __init__(self, db: DBSession, owner_id: int):
+        self.owner_id = owner_id
+        self.repo = TaskRepository(db, owner_id)
+        self.settings = get_settings()
 
-    def create_task(self, in_data: TaskCreate) -> TaskRead:
-        created = self.repo.create(title=in_data.title)
+    async def create_task(self, in_data: TaskCreate) -> TaskRead:
+        created = await self.repo.create(title=in_data.title)
         return TaskRead.model_validate(created)
 
-    def get_task(self, task_id: int) -> Optional[TaskRead]:
-        return self.repo.get(task_id)
+    async def get_task(self, task_id: int) -> Optional[TaskRead]:
+        task = await self.repo.get(task_id)
+        return None if task is None else TaskRead.model_validate(task)
+
+    async def list_tasks(
+            self,
+            limit: int,
+            cursor: Optional[str] = None,
+            order: SortOrder = "asc",
+            updated_since: Optional[datetime] = None,
+    ) -> Page[TaskRead]:
+        if updated_since is not None:
+            # timestamps are stored in UTC; a naive value is taken as UTC too
+            if updated_since.tzinfo is None:
+                updated_since = updated_since.replace(tzinfo=timezone.utc)
+            updated_since = updated_since.astimezone(timezone.utc)
+        try:
+            page = await self.repo.list(limit=limit, cursor=cursor, order=order, updated_since=updated_since)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        return Page[TaskRead].model_validate(page, from_attributes=True)
+
+    async def search_tasks(self, query: str, limit: int, cursor: Optional[str] = None) -> Page[TaskRead]:
+        try:
+            page = await self.repo.search(
+                query, limit=limit, cursor=cursor, max_results=self.settings.SEARCH_MAX_RESULTS
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        return Page[TaskRead].model_validate(page, from_attributes=True)
+
+    async def create_tasks(self, items: List[Any]) -> TaskBulkResult:
+        """Validate each item on its own and insert the valid ones in a single round trip."""
+        self._check_batch_size(items)
+        valid, errors = self._validate_items(items, TaskCreate)
+        rows = await self.repo.create_many([task.title for _, task in valid])
+        return TaskBulkResult(items=[TaskRead.model_validate(row) for row in rows], errors=errors)
+
+    async def update_tasks(self, items: List[Any]) -> TaskBulkResult:
+        """Validate each item on its own and apply the valid ones in one transaction."""
+        self._check_batch_size(items)
+        valid, errors = self._validate_items(items, TaskBulkUpdate)
+        rows = await self.repo.update_many([task.model_dump(exclude_unset=True, exclude_none=True) for _, task in valid])
+
+        updated = []
+        for index, task in valid:
+            row = rows.get(task.id)
+            if row is None:
+                errors.append(BulkItemError(index=index, detail=f"Task with id {task.id} not found"))
+            else:
+                updated.append(TaskRead.model_validate(row))
+        errors.sort(key=lambda error: error.index)
+        return TaskBulkResult(items=updated, errors=errors)
+
+    def _check_batch_size(self, items: List[Any]) -> None:
+        if len(items) > self.settings.TASK_BULK_MAX_ITEMS:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"At most {self.settings.TASK_BULK_MAX_ITEMS} tasks per request",
+            )
 
-    def list_tasks(self) -> List[TaskRead]:
-        return self.repo.list()
+    @staticmethod
+    def _validate_items(items: List[Any], schema):
+        valid, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                valid.append((index, schema.model_validate(item)))
+            except ValidationError as e:
+                errors.append(BulkItemError(index=index, detail=json.loads(e.json(include_url=False))))
+        return valid, errors
 
 
-def get_task_service(db: Session = Depends(get_db)) -> TaskService:
-    return TaskService(db)
+def get_task_service(
+        db: DBSession = Depends(get_db),
+        current_user: UserRead = Depends(get_authenticated_user),
+) -> TaskService:
+    """Task service scoped to the user of the bearer token."""
+    return TaskService(db, owner_id=current_user.id)
@@ -2,31 +2,43 @@
 from typing import Optional, Literal, get_args
 
 from fastapi import HTTPException, status, Depends
-from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import DBSession, get_db
+from app.repositories.pagination import InvalidCursorError
 from app.repositories.user_repository import UserRepository
-from app.schemas.user import UserRead, UserCreate
+from app.schemas.pagination import Page, SortOrder
+from app.schemas.user import UserRead, UserCreate, UserSortField
 
 UserPropertyIdentifier = Literal["id", "email", "username"]
 ALLOWED_IDENTIFIERS = get_args(UserPropertyIdentifier)
 
 
 class UserService:
-    def __init__(self, db: Session):
+    def __init__(self, db: DBSession):
         # store the session once…
         self.db = db
         # …and pass it into your repository
         self.repo = UserRepository(self.db)
 
-    def list_users(self):
-        return self.repo.list()
+    async def list_users(
+            self,
+            limit: int,
+            cursor: Optional[str] = None,
+            sort: UserSortField = "id",
+            order: SortOrder = "asc",
+            is_active: Optional[bool] = None,
+    ) -> Page[UserRead]:
+        try:
+            page = await self.repo.list(limit=limit, cursor=cursor, sort=sort, order=order, is_active=is_active)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        return Page[UserRead].model_validate(page, from_attributes=True)
 
-    def create_user(self, user_in: UserCreate) -> UserRead:
-        db_user = self.repo.create(user_in)
+    async def create_user(self, user_in: UserCreate) -> UserRead:
+        db_user = await self.repo.create(user_in)
         return UserRead.model_validate(db_user)
 
-    def get_user_by_identifier(
+    async def get_user_by_identifier(
             self,
             value: str | int,
             identifier: UserPropertyIdentifier = "id",
@@ -48,16 +60,16 @@ class UserService:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Value {value!r} is not a valid integer ID.",
                 )
-            db_user = self.repo.get_by_id(value)
+            db_user = await self.repo.get_by_id(value)
         elif identifier == "email":
-            db_user = self.repo.get_by_email(value)
+            db_user = await self.repo.get_by_email(value)
         elif identifier == "username":
-            db_user = self.repo.get_by_username(value)
+            db_user = await self.repo.get_by_username(value)
         else:
             db_user = None
 
         return None if db_user is None else UserRead.model_validate(db_user)
 
 
-def get_user_service(db: Session = Depends(get_db)) -> UserService:
+def get_user_service(db: DBSession = Depends(get_db)) -> UserService:
     return UserService(db)
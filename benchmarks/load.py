@@ -0,0 +1,237 @@
+"""
+In-process load test and latency benchmark for the v1 endpoints.
+
+Boots the app against a throwaway SQLite database, seeds users and tasks,
+then drives each scenario with a fixed number of concurrent clients through
+httpx's ASGI transport (no network, no server). For every scenario it reports
+p50/p95/p99 latency, throughput, errors and SQL statements per request as
+JSON, so runs can be diffed or checked against a stored baseline:
+
+    python -m benchmarks.load --requests 500 --concurrency 20 --output bench.json
+    python -m benchmarks.load --baseline bench.json --max-regression 0.25
+
+Settings are read from the environment at import time; the DB_URL, secrets
+and DB_PORT are filled with benchmark defaults unless already set. Rate
+limiting is off by default: every scenario comes from one client IP, so the
+auth limits (RATE_LIMIT_AUTH_PER_IP / _PER_USERNAME, 20 and 10 per minute)
+would turn most logins into 429s. Set RATE_LIMIT_ENABLED=true to measure
+the limiter itself.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List
+
+API_KEY = "benchmark-api-key"
+PASSWORD = "benchmark-password"
+SCENARIOS = ("login", "current_user", "list_tasks", "read_user", "create_task")
+
+
+@dataclass
+class ScenarioResult:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    queries: int = 0
+    duration: float = 0.0
+
+    def summary(self, concurrency: int) -> Dict:
+        timings = sorted(self.latencies)
+        count = len(timings)
+
+        def percentile(p: float) -> float:
+            return timings[min(count - 1, max(0, round(p * count) - 1))] * 1e3 if count else 0.0
+
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "concurrency": concurrency,
+            "duration_s": round(self.duration, 4),
+            "throughput_rps": round(count / self.duration, 2) if self.duration else 0.0,
+            "latency_ms": {
+                "mean": round(statistics.fmean(timings) * 1e3, 3) if count else 0.0,
+                "p50": round(percentile(0.50), 3),
+                "p95": round(percentile(0.95), 3),
+                "p99": round(percentile(0.99), 3),
+                "max": round(timings[-1] * 1e3, 3) if count else 0.0,
+            },
+            "queries_per_request": round(self.queries / count, 2) if count else 0.0,
+        }
+
+
+def configure_environment(database: str, async_db: bool) -> None:
+    os.environ.setdefault("DB_URL", f"sqlite:///{database}")
+    os.environ.setdefault("DB_PORT", "5432")
+    os.environ.setdefault("ACCESS_TOKEN_SECRET_KEY", "benchmark-secret-key-of-at-least-32-chars")
+    os.environ.setdefault("API_SECRET_KEY", API_KEY)
+    os.environ.setdefault("DB_ASYNC", "true" if async_db else "false")
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+
+def seed(users: int, tasks: int) -> None:
+    from sqlalchemy import insert
+
+    import app.main  # noqa: F401  the app as served: every model registered before create_all
+    from app.core.security import get_password_hash
+    from app.db.base import init_db
+    from app.db.session import database
+    from app.models.task import Task
+    from app.models.user import User
+
+    init_db()
+    hashed = get_password_hash(PASSWORD)  # one bcrypt round for everybody
+    with database.connect().session_factory() as db:
+        db.execute(insert(User), [
+            {
+                "name": f"Bench{i}", "lastname": "User", "email": f"bench{i}@example.com",
+                "username": f"bench{i}", "password": hashed, "is_active": True,
+            }
+            for i in range(users)
+        ])
+        # spread round-robin, so every user owns about tasks / users of them
+        db.execute(insert(Task), [
+            {"title": f"Benchmark task {i}", "owner_id": i % users + 1} for i in range(tasks)
+        ])
+        db.commit()
+
+
+def count_queries() -> Callable[[], int]:
+    from sqlalchemy import event
+
+    from app.db.session import database
+
+    total = [0]
+
+    def on_execute(*args):
+        total[0] += 1
+
+    for target in database.engines().values():
+        event.listen(target, "before_cursor_execute", on_execute)
+    return lambda: total[0]
+
+
+async def run_scenario(request: Callable[[int], Awaitable], total: int, concurrency: int, queries: Callable[[], int]) -> ScenarioResult:
+    result = ScenarioResult()
+    numbers = iter(range(total))
+
+    async def client():
+        for number in numbers:
+            started = time.perf_counter()
+            try:
+                response = await request(number)
+                ok = response.status_code < 400
+            except Exception:
+                ok = False
+            result.latencies.append(time.perf_counter() - started)
+            result.errors += not ok
+
+    queries_before = queries()
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    result.duration = time.perf_counter() - started
+    result.queries = queries() - queries_before
+    return result
+
+
+async def run(args) -> Dict:
+    import httpx
+
+    from app.core.password_hasher import password_hasher
+    from app.db.session import database
+    from app.main import app
+
+    queries = count_queries()
+    headers = {"X-API-Secret": API_KEY}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        login = await client.post("/api/v1/auth/login", data={"username": "bench0", "password": PASSWORD})
+        login.raise_for_status()
+        auth = {"Authorization": f"Bearer {login.json()['token']['value']}"}
+
+        requests = {
+            "login": lambda n: client.post(
+                "/api/v1/auth/login", data={"username": f"bench{n % args.users}", "password": PASSWORD}
+            ),
+            "current_user": lambda n: client.get("/api/v1/auth/current-user", headers=auth),
+            "list_tasks": lambda n: client.get("/api/v1/tasks/", params={"limit": args.page_size}, headers=auth),
+            "read_user": lambda n: client.get(f"/api/v1/users/{random.randint(1, args.users)}", headers=auth),
+            "create_task": lambda n: client.post("/api/v1/tasks/", json={"title": f"load {n}"}, headers=auth),
+        }
+
+        results = {}
+        for name in args.scenarios:
+            total = args.login_requests if name == "login" else args.requests
+            scenario = await run_scenario(requests[name], total, args.concurrency, queries)
+            results[name] = scenario.summary(args.concurrency)
+    await asyncio.to_thread(password_hasher.shutdown)
+    await database.dispose()
+    return results
+
+
+def compare(results: Dict, baseline: Dict, max_regression: float) -> List[str]:
+    """Scenarios whose p95 latency or queries per request grew more than allowed."""
+    failures = []
+    for name, result in results.items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        p95, previous_p95 = result["latency_ms"]["p95"], previous["latency_ms"]["p95"]
+        if previous_p95 and p95 > previous_p95 * (1 + max_regression):
+            failures.append(f"{name}: p95 {p95:.2f} ms > baseline {previous_p95:.2f} ms")
+        if result["queries_per_request"] > previous["queries_per_request"]:
+            failures.append(
+                f"{name}: {result['queries_per_request']} queries/request > "
+                f"baseline {previous['queries_per_request']}"
+            )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--login-requests", type=int, default=50, help="requests for the bcrypt-bound login scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--async-db", action="store_true", help="run with DB_ASYNC=true (aiosqlite)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report to compare against; exits 1 on regression")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="allowed relative p95 growth")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(os.path.join(tmp, "bench.db"), args.async_db)
+        seed(args.users, args.tasks)
+        scenarios = asyncio.run(run(args))
+
+    report = {
+        "config": {
+            key: getattr(args, key)
+            for key in ("users", "tasks", "requests", "login_requests", "concurrency", "page_size", "async_db")
+        },
+        "scenarios": scenarios,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = compare(scenarios, json.load(f), args.max_regression)
+        for failure in failures:
+            print(f"REGRESSION {failure}", file=sys.stderr)
+        sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Per-request overhead of APIKeyMiddleware.
+
+Compares the previous BaseHTTPMiddleware implementation with the pure ASGI
+one by driving a bare Starlette app directly through the ASGI interface (no
+network, no server), so the numbers isolate the middleware itself. Nothing
+has to be running or configured: the settings the middleware reads default
+to benchmark values unless set in the environment.
+
+    python -m benchmarks.middleware_overhead --requests 20000
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import statistics
+import time
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+API_KEY = "benchmark-secret"
+HEADER_NAME = "X-API-Secret"
+
+
+class LegacyAPIKeyMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware version kept as the baseline."""
+
+    async def dispatch(self, request: Request, call_next):
+        if request.method == "OPTIONS":
+            return await call_next(request)
+        api_key = request.headers.get(HEADER_NAME)
+        if not api_key:
+            return JSONResponse(status_code=403, content={"detail": "API secret header missing"})
+        provided_hash = hashlib.sha256(api_key.encode()).digest()
+        expected_hash = hashlib.sha256(API_KEY.encode()).digest()
+        if not hmac.compare_digest(provided_hash, expected_hash):
+            return JSONResponse(status_code=403, content={"detail": "Invalid API credentials"})
+        return await call_next(request)
+
+
+def configure_environment() -> None:
+    # required settings without defaults; APIKeyMiddleware reads the header name on construction
+    os.environ.setdefault("DB_PORT", "5432")
+    os.environ.setdefault("ACCESS_TOKEN_SECRET_KEY", "benchmark-secret-key-of-at-least-32-chars")
+    os.environ.setdefault("API_SECRET_KEY", API_KEY)
+    os.environ.setdefault("API_SECRET_HEADER_NAME", HEADER_NAME)
+
+
+async def ok(request: Request):
+    return PlainTextResponse("ok")
+
+
+def build_app(middleware=None, **options):
+    app = Starlette(routes=[Route("/ping", ok)])
+    if middleware is not None:
+        app.add_middleware(middleware, **options)
+    return app
+
+
+async def run(app, requests: int) -> list[float]:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (HEADER_NAME.lower().encode(), API_KEY.encode())],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message
+
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await app(dict(scope), receive, send)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def summarize(timings: list[float]) -> dict:
+    timings = sorted(timings)
+    return {
+        "mean_us": statistics.fmean(timings) * 1e6,
+        "p50_us": timings[len(timings) // 2] * 1e6,
+        "p99_us": timings[int(len(timings) * 0.99)] * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    configure_environment()
+    from app.middlewares.api_secret_middleware import APIKeyMiddleware
+
+    apps = {
+        "no_middleware": build_app(),
+        "base_http_middleware": build_app(LegacyAPIKeyMiddleware),
+        "asgi_middleware": build_app(APIKeyMiddleware, api_keys=[API_KEY]),
+    }
+    results = {}
+    for name, app in apps.items():
+        asyncio.run(run(app, 500))  # warm up
+        results[name] = summarize(asyncio.run(run(app, args.requests)))
+
+    baseline = results["no_middleware"]["mean_us"]
+    for name, result in results.items():
+        result["overhead_us"] = result["mean_us"] - baseline
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Response serialization cost for list endpoints.
+
+Serves the same N tasks three ways from an in-process FastAPI app (no
+database; rows are transient ORM objects):
+
+* ``orm_response_model``  - handler returns ORM objects, FastAPI validates and
+  serializes them through ``response_model`` (the original list endpoint)
+* ``double_validation``   - handler returns a validated ``Page`` and FastAPI
+  validates it again through ``response_model``
+* ``model_response``      - handler returns ``ModelResponse`` with the validated
+  ``Page``, serialized once by pydantic-core
+
+    python -m benchmarks.serialization --rows 1000 10000 --repeat 20
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timezone
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.responses import ModelResponse
+from app.models.task import Task
+from app.schemas.pagination import Page
+from app.schemas.task import TaskRead
+
+
+def build_app(rows: list[Task]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/orm_response_model", response_model=list[TaskRead])
+    async def orm_response_model():
+        return rows
+
+    @app.get("/double_validation", response_model=Page[TaskRead])
+    async def double_validation():
+        return Page[TaskRead].model_validate({"items": rows}, from_attributes=True)
+
+    @app.get("/model_response", response_model=Page[TaskRead])
+    async def model_response():
+        return ModelResponse(Page[TaskRead].model_validate({"items": rows}, from_attributes=True))
+
+    return app
+
+
+def measure(client: TestClient, path: str, repeat: int) -> dict:
+    client.get(path)  # warm up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(path)
+        timings.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.text
+    return {
+        "mean_ms": statistics.fmean(timings) * 1e3,
+        "p50_ms": sorted(timings)[len(timings) // 2] * 1e3,
+        "bytes": len(response.content),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    results = {}
+    for count in args.rows:
+        now = datetime.now(timezone.utc)
+        rows = [
+            Task(id=i, owner_id=1, title=f"task number {i}", created_at=now, updated_at=now)
+            for i in range(1, count + 1)
+        ]
+        client = TestClient(build_app(rows))
+        results[count] = {
+            path: measure(client, "/" + path, args.repeat)
+            for path in ("orm_response_model", "double_validation", "model_response")
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
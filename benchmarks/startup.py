@@ -0,0 +1,130 @@
+"""
+Cold start: time from spawning a uvicorn worker to its first HTTP response.
+
+Each run starts a fresh ``uvicorn app.main:app`` process against a throwaway
+SQLite database and polls until any response comes back. Without
+``--create-schema`` the tables are created once beforehand, like a migrated
+production database, and the timed runs skip ``create_all``. The app's own
+phase breakdown (``/internal/startup``) is collected from the same process.
+With ``--importtime`` the slowest modules reported by ``python -X importtime``
+are listed as well.
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --runs 5 --importtime 15 --output startup.json
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+
+API_KEY = "benchmark-api-key"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def environment(database: str, create_schema: bool) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("DB_URL", f"sqlite:///{database}")
+    env.setdefault("DB_PORT", "5432")
+    env.setdefault("ACCESS_TOKEN_SECRET_KEY", "benchmark-secret-key-of-at-least-32-chars")
+    env.setdefault("API_SECRET_KEY", API_KEY)
+    env["DB_CREATE_SCHEMA"] = "true" if create_schema else "false"
+    return env
+
+
+def create_schema(env: Dict[str, str]) -> None:
+    """Create the tables in a separate process, so the timed runs find a migrated database."""
+    subprocess.run([sys.executable, "-c", "from app.db.base import init_db; init_db()"], env=env, check=True)
+
+
+def measure_once(env: Dict[str, str], timeout: float) -> Dict:
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        headers = {"X-API-Secret": env["API_SECRET_KEY"]}
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", headers=headers) as client:
+            while True:
+                if time.perf_counter() - started > timeout:
+                    raise TimeoutError(f"no response within {timeout}s")
+                if process.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with code {process.returncode} before responding")
+                try:
+                    client.get("/internal/startup")
+                    break
+                except httpx.TransportError:
+                    time.sleep(0.005)
+            first_response = time.perf_counter() - started
+            profile = client.get("/internal/startup").json()
+    finally:
+        process.terminate()
+        process.wait()
+    return {"first_response_ms": round(first_response * 1e3, 2), "app": profile}
+
+
+def slowest_imports(env: Dict[str, str], top: int) -> List[Dict]:
+    """Modules with the highest cumulative import time, as reported by -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = (part.strip() for part in line[len("import time:"):].split("|"))
+        imports.append({"module": module.strip(), "cumulative_ms": int(cumulative) / 1e3})
+    return sorted(imports, key=lambda item: item["cumulative_ms"], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--create-schema", action="store_true", help="include create_all (non-production startup)")
+    parser.add_argument("--importtime", type=int, default=0, metavar="N", help="also list the N slowest imports")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = environment(os.path.join(tmp, "bench.db"), args.create_schema)
+        if not args.create_schema:
+            create_schema(env)
+        runs = [measure_once(env, args.timeout) for _ in range(args.runs)]
+        timings = [run["first_response_ms"] for run in runs]
+        report = {
+            "config": {"runs": args.runs, "create_schema": args.create_schema},
+            "first_response_ms": {
+                "min": min(timings),
+                "median": round(statistics.median(timings), 2),
+                "max": max(timings),
+            },
+            "runs": runs,
+        }
+        if args.importtime:
+            report["slowest_imports"] = slowest_imports(env, args.importtime)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
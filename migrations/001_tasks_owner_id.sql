@@ -0,0 +1,31 @@
+-- Upgrade an existing Postgres database to owner-scoped tasks (tasks.owner_id).
+--
+-- create_all does not alter existing tables. Tasks created before this change
+-- have no owner, so they are given to the user passed as owner_id, or deleted
+-- with owner_id=NULL:
+--
+--     psql "$DB_URL" -v owner_id=<users.id> -f migrations/001_tasks_owner_id.sql
+--     psql "$DB_URL" -v owner_id=NULL -f migrations/001_tasks_owner_id.sql
+--
+-- Runs in one transaction; safe to re-run.
+\set ON_ERROR_STOP on
+
+BEGIN;
+
+-- task timestamps (needed by the (owner_id, updated_at, id) index); no-op if present
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now();
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now();
+
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS owner_id INTEGER;
+UPDATE tasks SET owner_id = :owner_id WHERE owner_id IS NULL;
+DELETE FROM tasks WHERE owner_id IS NULL;
+ALTER TABLE tasks ALTER COLUMN owner_id SET NOT NULL;
+
+ALTER TABLE tasks DROP CONSTRAINT IF EXISTS tasks_owner_id_fkey;
+ALTER TABLE tasks ADD CONSTRAINT tasks_owner_id_fkey
+    FOREIGN KEY (owner_id) REFERENCES users (id) ON DELETE CASCADE;
+
+CREATE INDEX IF NOT EXISTS ix_tasks_owner_id_id ON tasks (owner_id, id);
+CREATE INDEX IF NOT EXISTS ix_tasks_owner_id_updated_at_id ON tasks (owner_id, updated_at, id);
+
+COMMIT;
@@ -0,0 +1,16 @@
+-- Upgrade an existing Postgres database for GET /tasks/search (title search indexes).
+--
+--     psql "$DB_URL" -f migrations/002_tasks_title_search.sql
+--
+-- CONCURRENTLY keeps the table writable while the indexes build, so this file
+-- runs outside a transaction; safe to re-run. Creating the extensions needs a
+-- role allowed to (the database owner on Postgres 13+).
+\set ON_ERROR_STOP on
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_owner_id_title_tsv
+    ON tasks USING gin (owner_id, to_tsvector('simple'::regconfig, title));
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_owner_id_title_trgm
+    ON tasks USING gin (owner_id, title gin_trgm_ops);
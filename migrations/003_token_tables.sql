@@ -0,0 +1,36 @@
+-- Upgrade an existing Postgres database for token revocation and refresh tokens.
+--
+--     psql "$DB_URL" -f migrations/003_token_tables.sql
+--
+-- Startup loads revoked_tokens and the auth endpoints use refresh_tokens, so a
+-- production database (no create_all) needs this before the new version starts.
+-- Runs in one transaction; safe to re-run.
+\set ON_ERROR_STOP on
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti VARCHAR NOT NULL PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    revoked_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_revoked_tokens_expires_at ON revoked_tokens (expires_at);
+CREATE INDEX IF NOT EXISTS ix_revoked_tokens_revoked_at ON revoked_tokens (revoked_at);
+CREATE INDEX IF NOT EXISTS ix_revoked_tokens_user_id ON revoked_tokens (user_id);
+
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    id SERIAL NOT NULL PRIMARY KEY,
+    token_hash VARCHAR NOT NULL,
+    family_id VARCHAR NOT NULL,
+    user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    revoked_at TIMESTAMP WITH TIME ZONE
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_refresh_tokens_token_hash ON refresh_tokens (token_hash);
+CREATE INDEX IF NOT EXISTS ix_refresh_tokens_family_id ON refresh_tokens (family_id);
+CREATE INDEX IF NOT EXISTS ix_refresh_tokens_user_id ON refresh_tokens (user_id);
+CREATE INDEX IF NOT EXISTS ix_refresh_tokens_expires_at ON refresh_tokens (expires_at);
+
+COMMIT;
@@ -0,0 +1,28 @@
+-- Upgrade an existing Postgres database to the users timestamps of TimestampMixin
+-- and the (created_at, id) index behind GET /users/?sort=created_at.
+--
+--     PGTZ=<zone the app servers ran in> psql "$DB_URL" -f migrations/004_users_timestamps.sql
+--
+-- The old columns were naive (TIMESTAMP WITHOUT TIME ZONE) local times written
+-- by the app; they are converted as times in the session time zone, so set
+-- PGTZ when the servers did not run in UTC. Rows without a value get now().
+-- Runs in one transaction (the index build blocks writes to users until it
+-- commits); safe to re-run.
+\set ON_ERROR_STOP on
+
+BEGIN;
+
+ALTER TABLE users ALTER COLUMN created_at TYPE TIMESTAMP WITH TIME ZONE;
+ALTER TABLE users ALTER COLUMN updated_at TYPE TIMESTAMP WITH TIME ZONE;
+
+UPDATE users SET created_at = now() WHERE created_at IS NULL;
+UPDATE users SET updated_at = created_at WHERE updated_at IS NULL;
+
+ALTER TABLE users ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE users ALTER COLUMN updated_at SET DEFAULT now();
+ALTER TABLE users ALTER COLUMN created_at SET NOT NULL;
+ALTER TABLE users ALTER COLUMN updated_at SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS ix_users_created_at_id ON users (created_at, id);
+
+COMMIT;